@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -11,6 +13,9 @@ class Settings(BaseSettings):
     enable_screen: bool = Field(
         default=True, description="Enable screen capture functionality"
     )
+    camera_warmup: bool = Field(
+        default=False, description="Probe cameras in the background at startup"
+    )
 
     model_config = {
         "env_prefix": "MCP_",
@@ -18,8 +23,10 @@ class Settings(BaseSettings):
         "env_file": ".env",
         "env_file_encoding": "utf-8",
         "extra": "ignore",
+        "frozen": True,
     }
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     return Settings()
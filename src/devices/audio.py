@@ -1,16 +1,348 @@
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from typing import Annotated
+from functools import lru_cache
+from dataclasses import dataclass
 from fastmcp import FastMCP
 from pydantic import Field
 import threading
 import platform
+import asyncio
+import atexit
+import queue
+import io
 import tempfile
-import datetime
 import pyaudio
+import numpy as np
+import time
 import wave
 import os
 
+_SYSTEM = platform.system()
+_TEMP_DIR = tempfile.gettempdir()
+
+_RECORD_INIT_HINT = {
+    "Darwin": " On macOS, check microphone permissions in System Preferences > Security & Privacy > Privacy > Microphone",
+    "Linux": " On Linux, ensure ALSA or PulseAudio is running and user has audio group permissions",
+    "Windows": " On Windows, ensure audio drivers are installed and microphone is not in use by another application",
+}.get(_SYSTEM, "")
+_PLAYBACK_INIT_HINT = {
+    "Darwin": " On macOS, check audio output permissions and ensure no other app is using exclusive access",
+    "Linux": " On Linux, ensure ALSA or PulseAudio is running",
+    "Windows": " On Windows, ensure audio drivers are installed",
+}.get(_SYSTEM, "")
+
 _active_audio_recording = None
+_RECORDING_STARTING = object()
+
+_PLAYBACK_CHUNK = 4096
+_CAPTURE_TIMEOUT_GRACE = 2.0
+_BACKGROUND_RECORD_CHUNK = 8192
+_WAV_WRITE_BUFFER_SIZE = 1 << 20
+# Only short clips (UI sounds) are cached; with _load_wav's maxsize this caps
+# the cache at about 32 MB.
+_WAV_CACHE_MAX_FILE_SIZE = 1024 * 1024
+
+_SAMPLE_FORMATS = {
+    1: pyaudio.paUInt8,
+    2: pyaudio.paInt16,
+    3: pyaudio.paInt24,
+    4: pyaudio.paInt32,
+}
+_SAMPLE_DTYPES = {2: np.int16, 4: np.int32}
+_RECORD_FORMAT = pyaudio.paInt16
+_RECORD_SAMPLE_WIDTH = pyaudio.get_sample_size(_RECORD_FORMAT)
+
+_pyaudio = None
+_pyaudio_scanned = False
+_open_stream_count = 0
+_pyaudio_lock = threading.RLock()
+
+_DEVICE_CACHE_TTL = 30.0
+_device_cache = {"ts": 0.0, "data": None, "by_index": None}
+_device_cache_lock = threading.Lock()
+
+
+@dataclass(slots=True)
+class AudioDeviceInfo:
+    index: int
+    name: str
+    max_input_channels: int
+    max_output_channels: int
+    default_sample_rate: float
+    host_api: str
+
+
+def _get_pyaudio() -> pyaudio.PyAudio:
+    global _pyaudio
+
+    with _pyaudio_lock:
+        if _pyaudio is None:
+            _pyaudio = pyaudio.PyAudio()
+        return _pyaudio
+
+
+def _pyaudio_for_scan() -> pyaudio.PyAudio:
+    """Return a PyAudio instance whose device list reflects the current hardware.
+
+    PortAudio only builds its device list in Pa_Initialize, so once an
+    instance has been scanned it is recreated for the next scan. That is only
+    safe while no stream is open; until then the previous list is reused.
+    """
+    global _pyaudio, _pyaudio_scanned
+
+    with _pyaudio_lock:
+        if _pyaudio is not None and _pyaudio_scanned and _open_stream_count == 0:
+            _pyaudio.terminate()
+            _pyaudio = None
+        _pyaudio_scanned = True
+        return _get_pyaudio()
+
+
+def _open_stream(**kwargs: Any) -> pyaudio.Stream:
+    global _open_stream_count
+
+    # Opened under the lock so a rescan cannot terminate the instance between
+    # the lookup and the open.
+    with _pyaudio_lock:
+        stream = _get_pyaudio().open(**kwargs)
+        _open_stream_count += 1
+        return stream
+
+
+def _close_stream(stream: pyaudio.Stream) -> None:
+    global _open_stream_count
+
+    # Each step runs even if the one before fails, or the count would never
+    # get back to zero and device rescans would keep a stale PyAudio.
+    try:
+        try:
+            stream.stop_stream()
+        finally:
+            stream.close()
+    finally:
+        with _pyaudio_lock:
+            _open_stream_count -= 1
+
+
+def _get_default_device_info(input: bool) -> Dict[str, Any]:
+    with _pyaudio_lock:
+        p = _get_pyaudio()
+        if input:
+            return p.get_default_input_device_info()
+        return p.get_default_output_device_info()
+
+
+@atexit.register
+def _terminate_pyaudio() -> None:
+    if _pyaudio is not None:
+        _pyaudio.terminate()
+
+
+def _invalidate_device_cache() -> None:
+    with _device_cache_lock:
+        _device_cache["ts"] = 0.0
+        _device_cache["data"] = None
+        _device_cache["by_index"] = None
+
+
+def _enumerate_devices(
+    p: pyaudio.PyAudio,
+) -> Tuple[Dict[str, List[AudioDeviceInfo]], Dict[int, Dict[str, Any]]]:
+    input_devices = []
+    output_devices = []
+    by_index = {}
+    host_apis = {
+        i: p.get_host_api_info_by_index(i)["name"]
+        for i in range(p.get_host_api_count())
+    }
+
+    for i in range(p.get_device_count()):
+        try:
+            device_info = p.get_device_info_by_index(i)
+            by_index[i] = device_info
+            if (
+                device_info["maxInputChannels"] == 0
+                and device_info["maxOutputChannels"] == 0
+            ):
+                continue
+
+            device_data = AudioDeviceInfo(
+                index=i,
+                name=device_info["name"],
+                max_input_channels=device_info["maxInputChannels"],
+                max_output_channels=device_info["maxOutputChannels"],
+                default_sample_rate=device_info["defaultSampleRate"],
+                host_api=host_apis[device_info["hostApi"]],
+            )
+
+            if device_info["maxInputChannels"] > 0:
+                input_devices.append(device_data)
+
+            if device_info["maxOutputChannels"] > 0:
+                output_devices.append(device_data)
+        except Exception:
+            continue
+
+    return {"input_devices": input_devices, "output_devices": output_devices}, by_index
+
+
+def _get_devices(
+    refresh: bool = False,
+) -> Tuple[Dict[str, List[AudioDeviceInfo]], Dict[int, Dict[str, Any]]]:
+    with _device_cache_lock:
+        if (
+            not refresh
+            and _device_cache["data"] is not None
+            and time.monotonic() - _device_cache["ts"] < _DEVICE_CACHE_TTL
+        ):
+            return _device_cache["data"], _device_cache["by_index"]
+        requested = time.monotonic()
+
+    with _pyaudio_lock:
+        with _device_cache_lock:
+            # A scan that finished while this one waited for the lock is as
+            # fresh as a new one, and rescanning reinitialises PortAudio.
+            if _device_cache["data"] is not None and _device_cache["ts"] >= requested:
+                return _device_cache["data"], _device_cache["by_index"]
+        devices, by_index = _enumerate_devices(_pyaudio_for_scan())
+        with _device_cache_lock:
+            _device_cache["data"] = devices
+            _device_cache["by_index"] = by_index
+            _device_cache["ts"] = time.monotonic()
+    return devices, by_index
+
+
+def _get_device_info(device_index: int) -> Dict[str, Any]:
+    _, by_index = _get_devices()
+    if device_index not in by_index:
+        _, by_index = _get_devices(refresh=True)
+    if device_index not in by_index:
+        # Let PortAudio raise its usual invalid-device error.
+        with _pyaudio_lock:
+            return _get_pyaudio().get_device_info_by_index(device_index)
+    return by_index[device_index]
+
+
+def _open_wav_data(file_path: str) -> Tuple[int, int, int, int, io.BufferedReader]:
+    # Returns the parsed header and the file positioned at the PCM payload, so
+    # the file is opened and parsed exactly once; the caller closes it.
+    raw = open(file_path, "rb")
+    try:
+        with wave.open(raw, "rb") as wf:
+            # wave stops parsing at the data chunk header and leaves a file
+            # object it was given open.
+            return (
+                wf.getnchannels(),
+                wf.getsampwidth(),
+                wf.getframerate(),
+                wf.getnframes(),
+                raw,
+            )
+    except BaseException:
+        raw.close()
+        raise
+
+
+@lru_cache(maxsize=32)
+def _load_wav(
+    file_path: str, mtime_ns: int, size: int
+) -> Tuple[int, int, int, int, bytes]:
+    with wave.open(file_path, "rb") as wf:
+        frames = wf.getnframes()
+        return (
+            wf.getnchannels(),
+            wf.getsampwidth(),
+            wf.getframerate(),
+            frames,
+            wf.readframes(frames),
+        )
+
+
+def _stream_wav_data(
+    write: Callable[[Any], None],
+    raw: io.BufferedReader,
+    data_size: int,
+    chunk_bytes: int,
+) -> None:
+    # Plain reads rather than an mmap: a file truncated or rewritten during
+    # playback just ends early instead of faulting the process. read() also
+    # returns bytes, which is what PyAudio's write accepts. A reader thread
+    # keeps the next chunk ready, so a slow read doesn't starve the output
+    # between writes.
+    chunks = queue.Queue(maxsize=1)
+    stopped = threading.Event()
+    failure = []
+
+    def read_ahead():
+        try:
+            with raw:
+                if hasattr(os, "posix_fadvise"):
+                    # Let the kernel read ahead of the playback position.
+                    os.posix_fadvise(
+                        raw.fileno(), raw.tell(), 0, os.POSIX_FADV_SEQUENTIAL
+                    )
+                remaining = data_size
+                while remaining > 0 and not stopped.is_set():
+                    data = raw.read(min(remaining, chunk_bytes))
+                    if not data:
+                        break
+                    chunks.put(data)
+                    remaining -= len(data)
+        except Exception as e:
+            failure.append(e)
+        finally:
+            chunks.put(None)
+
+    reader = threading.Thread(target=read_ahead, name="wav-read-ahead", daemon=True)
+    reader.start()
+    try:
+        while (data := chunks.get()) is not None:
+            write(data)
+    finally:
+        stopped.set()
+        # Take whatever the reader is still handing over so it can finish.
+        while reader.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+    if failure:
+        raise failure[0]
+
+
+def _open_wav_writer(
+    output_file: str, channels: int, sample_width: int, sample_rate: int
+) -> Tuple[io.BufferedWriter, wave.Wave_write]:
+    # wave leaves a file object it was given open, so callers close both.
+    raw_file = open(output_file, "wb", buffering=_WAV_WRITE_BUFFER_SIZE)
+    wf = wave.open(raw_file, "wb")
+    wf.setnchannels(channels)
+    wf.setsampwidth(sample_width)
+    wf.setframerate(sample_rate)
+    return raw_file, wf
+
+
+def _close_wav_writer(raw_file: io.BufferedWriter, wf: wave.Wave_write) -> None:
+    wf.close()
+    raw_file.close()
+
+
+def _stop_background_recording(recording: Dict[str, Any]) -> None:
+    recording["thread"].join(timeout=5.0)
+    _close_stream(recording["stream"])
+
+
+def _drain_to_wav(captured: queue.SimpleQueue, wf: wave.Wave_write) -> bool:
+    # Chunks are appended with writeframesraw; the header is patched once when
+    # the writer is closed.
+    while True:
+        try:
+            data = captured.get(timeout=_CAPTURE_TIMEOUT_GRACE)
+        except queue.Empty:
+            return False
+        if data is None:
+            return True
+        wf.writeframesraw(data)
 
 
 def register_tools(app: FastMCP) -> None:
@@ -19,54 +351,34 @@ def register_tools(app: FastMCP) -> None:
         description="List all available audio input and output devices",
         tags=["audio"],
     )
-    async def list_audio_devices() -> Dict[str, List[Dict[str, Any]]]:
+    async def list_audio_devices(
+        force_refresh: Annotated[
+            bool,
+            Field(
+                default=False,
+                description="Re-enumerate devices instead of returning the cached list",
+            ),
+        ] = False,
+    ) -> Dict[str, List[AudioDeviceInfo]]:
         try:
-            p = pyaudio.PyAudio()
+            await asyncio.to_thread(_get_pyaudio)
         except Exception as e:
             return {
                 "input_devices": [],
                 "output_devices": [],
                 "error": f"Failed to initialize audio system: {str(e)}. "
-                f"On {platform.system()}, ensure audio drivers are installed and permissions are granted.",
+                f"On {_SYSTEM}, ensure audio drivers are installed and permissions are granted.",
             }
 
         try:
-            input_devices = []
-            output_devices = []
-
-            for i in range(p.get_device_count()):
-                try:
-                    device_info = p.get_device_info_by_index(i)
-                    device_data = {
-                        "name": device_info["name"],
-                        "max_input_channels": device_info["maxInputChannels"],
-                        "max_output_channels": device_info["maxOutputChannels"],
-                        "default_sample_rate": device_info["defaultSampleRate"],
-                        "host_api": p.get_host_api_info_by_index(
-                            device_info["hostApi"]
-                        )["name"],
-                    }
-
-                    if device_info["maxInputChannels"] > 0:
-                        input_devices.append(device_data)
-
-                    if device_info["maxOutputChannels"] > 0:
-                        output_devices.append(device_data)
-                except Exception:
-                    continue
-
-            return {"input_devices": input_devices, "output_devices": output_devices}
+            devices, _ = await asyncio.to_thread(_get_devices, force_refresh)
+            return devices
         except Exception as e:
             return {
                 "input_devices": [],
                 "output_devices": [],
                 "error": f"Error listing devices: {str(e)}",
             }
-        finally:
-            try:
-                p.terminate()
-            except Exception:
-                pass
 
     @app.tool(
         name="record_audio",
@@ -111,131 +423,168 @@ def register_tools(app: FastMCP) -> None:
                 "error": "Duration must be positive or -1 for background recording",
             }
 
-        chunk = 1024
-        format = pyaudio.paInt16
+        # Background reads go through a deeper buffer so GIL or disk stalls in
+        # the record thread don't overrun PortAudio's input ring.
+        chunk = _BACKGROUND_RECORD_CHUNK if duration == -1 else 1024
 
         if output_file is None:
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"recording_{timestamp}.wav"
-            output_file = os.path.join(tempfile.gettempdir(), filename)
+            filename = f"recording_{time.strftime('%Y%m%d_%H%M%S')}.wav"
+            output_file = os.path.join(_TEMP_DIR, filename)
 
+        if duration == -1:
+            # Hold the slot while the stream is opened so a concurrent start or
+            # stop cannot interleave with the awaits below.
+            _active_audio_recording = _RECORDING_STARTING
         try:
-            p = pyaudio.PyAudio()
-        except Exception as e:
-            error_msg = f"Failed to initialize audio system: {str(e)}"
-            if platform.system() == "Darwin":
-                error_msg += " On macOS, check microphone permissions in System Preferences > Security & Privacy > Privacy > Microphone"
-            elif platform.system() == "Linux":
-                error_msg += " On Linux, ensure ALSA or PulseAudio is running and user has audio group permissions"
-            elif platform.system() == "Windows":
-                error_msg += " On Windows, ensure audio drivers are installed and microphone is not in use by another application"
-            return {"success": False, "error": error_msg}
+            try:
+                await asyncio.to_thread(_get_pyaudio)
+            except Exception as e:
+                error_msg = f"Failed to initialize audio system: {str(e)}"
+                return {"success": False, "error": error_msg + _RECORD_INIT_HINT}
 
-        try:
-            device_info = None
-            if device_index is not None:
-                device_info = p.get_device_info_by_index(device_index)
-                if device_info["maxInputChannels"] == 0:
+            try:
+                device_info = None
+                if device_index is not None:
+                    device_info = await asyncio.to_thread(
+                        _get_device_info, device_index
+                    )
+                    if device_info["maxInputChannels"] == 0:
+                        return {
+                            "success": False,
+                            "error": f"Device {device_index} is not an input device",
+                        }
+                else:
+                    device_info = await asyncio.to_thread(
+                        _get_default_device_info, True
+                    )
+                    device_index = device_info["index"]
+
+                sample_width = _RECORD_SAMPLE_WIDTH
+                stream_callback = None
+                if duration != -1:
+                    remaining = int(sample_rate * duration) * channels * sample_width
+                    captured = queue.SimpleQueue()
+
+                    def capture_callback(in_data, frame_count, time_info, status):
+                        nonlocal remaining
+                        data = in_data[:remaining]
+                        remaining -= len(data)
+                        captured.put(data)
+                        if remaining > 0:
+                            return (None, pyaudio.paContinue)
+                        captured.put(None)
+                        return (None, pyaudio.paComplete)
+
+                    stream_callback = capture_callback
+
+                try:
+                    stream = await asyncio.to_thread(
+                        _open_stream,
+                        format=_RECORD_FORMAT,
+                        channels=channels,
+                        rate=sample_rate,
+                        input=True,
+                        frames_per_buffer=chunk,
+                        input_device_index=device_index,
+                        stream_callback=stream_callback,
+                    )
+                except Exception as e:
+                    error_msg = f"Failed to open audio stream: {str(e)}"
+                    if "Invalid device" in str(e):
+                        _invalidate_device_cache()
+                        error_msg += f" Device index {device_index} may not exist or may not support the requested format."
+                    elif "Device unavailable" in str(e) or "busy" in str(e).lower():
+                        error_msg += (
+                            " Audio device is currently in use by another application."
+                        )
+                    elif _SYSTEM == "Linux" and "ALSA" in str(e):
+                        error_msg += " ALSA error - try different sample rate or check audio system configuration."
+                    return {"success": False, "error": error_msg}
+
+                try:
+                    raw_file, wf = await asyncio.to_thread(
+                        _open_wav_writer,
+                        output_file,
+                        channels,
+                        sample_width,
+                        sample_rate,
+                    )
+                except Exception as e:
+                    await asyncio.to_thread(_close_stream, stream)
                     return {
                         "success": False,
-                        "error": f"Device {device_index} is not an input device",
+                        "error": f"Failed to create audio file: {str(e)}",
                     }
-            else:
-                device_index = p.get_default_input_device_info()["index"]
-                device_info = p.get_default_input_device_info()
 
-            try:
-                stream = p.open(
-                    format=format,
-                    channels=channels,
-                    rate=sample_rate,
-                    input=True,
-                    frames_per_buffer=chunk,
-                    input_device_index=device_index,
-                )
-            except Exception as e:
-                error_msg = f"Failed to open audio stream: {str(e)}"
-                if "Invalid device" in str(e):
-                    error_msg += f" Device index {device_index} may not exist or may not support the requested format."
-                elif "Device unavailable" in str(e) or "busy" in str(e).lower():
-                    error_msg += (
-                        " Audio device is currently in use by another application."
-                    )
-                elif platform.system() == "Linux" and "ALSA" in str(e):
-                    error_msg += " ALSA error - try different sample rate or check audio system configuration."
-                return {"success": False, "error": error_msg}
+                if duration == -1:
+                    stop_event = threading.Event()
+
+                    def background_record():
+                        try:
+                            while not stop_event.is_set():
+                                data = stream.read(chunk, exception_on_overflow=False)
+                                wf.writeframesraw(data)
+                        except Exception:
+                            pass
+
+                    record_thread = threading.Thread(target=background_record)
+                    record_thread.daemon = True
+                    record_thread.start()
+
+                    _active_audio_recording = {
+                        "stream": stream,
+                        "raw_file": raw_file,
+                        "wave_file": wf,
+                        "stop_event": stop_event,
+                        "thread": record_thread,
+                        "output_file": output_file,
+                        "sample_rate": sample_rate,
+                        "channels": channels,
+                        "device_info": device_info,
+                        "start_time": time.monotonic(),
+                    }
 
-            if duration == -1:
-                frames = []
-                stop_event = threading.Event()
+                    return {
+                        "success": True,
+                        "output_file": output_file,
+                        "sample_rate": sample_rate,
+                        "channels": channels,
+                        "device_used": device_info["name"]
+                        if device_info
+                        else "Default device",
+                        "recording_status": "started",
+                        "message": "Background recording started. Use stop_record_audio to stop.",
+                    }
 
-                def background_record():
+                try:
+                    completed = await asyncio.to_thread(_drain_to_wav, captured, wf)
+                finally:
                     try:
-                        while not stop_event.is_set():
-                            data = stream.read(chunk, exception_on_overflow=False)
-                            frames.append(data)
-                    except Exception:
-                        pass
-
-                record_thread = threading.Thread(target=background_record)
-                record_thread.daemon = True
-                record_thread.start()
-
-                _active_audio_recording = {
-                    "stream": stream,
-                    "pyaudio": p,
-                    "frames": frames,
-                    "stop_event": stop_event,
-                    "thread": record_thread,
-                    "output_file": output_file,
-                    "sample_rate": sample_rate,
-                    "channels": channels,
-                    "format": format,
-                    "device_info": device_info,
-                    "start_time": datetime.datetime.now(),
-                }
+                        await asyncio.to_thread(_close_stream, stream)
+                    finally:
+                        await asyncio.to_thread(_close_wav_writer, raw_file, wf)
+
+                if not completed:
+                    return {
+                        "success": False,
+                        "error": "Audio device stopped delivering samples before the recording finished",
+                    }
 
                 return {
                     "success": True,
                     "output_file": output_file,
+                    "duration": duration,
                     "sample_rate": sample_rate,
                     "channels": channels,
                     "device_used": device_info["name"]
                     if device_info
                     else "Default device",
-                    "recording_status": "started",
-                    "message": "Background recording started. Use stop_record_audio to stop.",
                 }
-
-            frames = []
-            total_frames = int(sample_rate / chunk * duration)
-
-            for i in range(total_frames):
-                data = stream.read(chunk)
-                frames.append(data)
-
-            stream.stop_stream()
-            stream.close()
-
-            with wave.open(output_file, "wb") as wf:
-                wf.setnchannels(channels)
-                wf.setsampwidth(p.get_sample_size(format))
-                wf.setframerate(sample_rate)
-                wf.writeframes(b"".join(frames))
-
-            return {
-                "success": True,
-                "output_file": output_file,
-                "duration": duration,
-                "sample_rate": sample_rate,
-                "channels": channels,
-                "device_used": device_info["name"] if device_info else "Default device",
-            }
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+            except Exception as e:
+                return {"success": False, "error": str(e)}
         finally:
-            if duration != -1:
-                p.terminate()
+            if _active_audio_recording is _RECORDING_STARTING:
+                _active_audio_recording = None
 
     @app.tool(
         name="play_audio",
@@ -250,90 +599,135 @@ def register_tools(app: FastMCP) -> None:
                 default=None, description="Audio output device index (None for default)"
             ),
         ] = None,
+        volume: Annotated[
+            int,
+            Field(
+                default=100,
+                ge=0,
+                le=100,
+                description="Playback volume as a percentage of the original level",
+            ),
+        ] = 100,
     ) -> Dict[str, Any]:
+        # A large file stays open for streaming; the playback thread closes it
+        # once started, and until then every exit below has to.
+        wav_file = None
+        playing = False
         try:
-            with wave.open(file_path, "rb") as wf:
-                channels = wf.getnchannels()
-                sample_width = wf.getsampwidth()
-                sample_rate = wf.getframerate()
-                frames = wf.getnframes()
-                duration = frames / sample_rate
-
-                try:
-                    p = pyaudio.PyAudio()
-                except Exception as e:
-                    error_msg = f"Failed to initialize audio system: {str(e)}"
-                    if platform.system() == "Darwin":
-                        error_msg += " On macOS, check audio output permissions and ensure no other app is using exclusive access"
-                    elif platform.system() == "Linux":
-                        error_msg += " On Linux, ensure ALSA or PulseAudio is running"
-                    elif platform.system() == "Windows":
-                        error_msg += " On Windows, ensure audio drivers are installed"
-                    return {"success": False, "error": error_msg}
-
-                try:
-                    device_info = None
-                    if device_index is not None:
-                        device_info = p.get_device_info_by_index(device_index)
-                        if device_info["maxOutputChannels"] == 0:
-                            return {
-                                "success": False,
-                                "error": f"Device {device_index} is not an output device",
-                            }
-                    else:
-                        device_index = p.get_default_output_device_info()["index"]
-                        device_info = p.get_default_output_device_info()
+            stat = os.stat(file_path)
+            pcm = None
+            if stat.st_size <= _WAV_CACHE_MAX_FILE_SIZE:
+                (
+                    channels,
+                    sample_width,
+                    sample_rate,
+                    frames,
+                    pcm,
+                ) = await asyncio.to_thread(
+                    _load_wav, file_path, stat.st_mtime_ns, stat.st_size
+                )
+            else:
+                (
+                    channels,
+                    sample_width,
+                    sample_rate,
+                    frames,
+                    wav_file,
+                ) = await asyncio.to_thread(_open_wav_data, file_path)
+            duration = frames / sample_rate
+            data_size = frames * channels * sample_width
+
+            if sample_width not in _SAMPLE_FORMATS:
+                return {
+                    "success": False,
+                    "error": f"Unsupported WAV sample width: {sample_width} bytes",
+                }
+            if volume != 100 and sample_width not in _SAMPLE_DTYPES:
+                return {
+                    "success": False,
+                    "error": "Volume control requires a 16-bit or 32-bit WAV file",
+                }
 
-                    try:
-                        stream = p.open(
-                            format=p.get_format_from_width(sample_width),
-                            channels=channels,
-                            rate=sample_rate,
-                            output=True,
-                            output_device_index=device_index,
-                        )
-                    except Exception as e:
-                        error_msg = f"Failed to open audio output stream: {str(e)}"
-                        if "Invalid device" in str(e):
-                            error_msg += f" Device index {device_index} may not exist or may not support playback."
-                        elif "Device unavailable" in str(e) or "busy" in str(e).lower():
-                            error_msg += " Audio device is currently in use by another application."
-                        elif platform.system() == "Linux" and "ALSA" in str(e):
-                            error_msg += " ALSA error - try different sample rate or check audio system configuration."
-                        return {"success": False, "error": error_msg}
-
-                    def play_in_background():
-                        try:
-                            with wave.open(file_path, "rb") as wf_bg:
-                                chunk = 1024
-                                data = wf_bg.readframes(chunk)
-                                while data:
-                                    stream.write(data)
-                                    data = wf_bg.readframes(chunk)
-                        finally:
-                            stream.stop_stream()
-                            stream.close()
-                            p.terminate()
-
-                    play_thread = threading.Thread(target=play_in_background)
-                    play_thread.daemon = True
-                    play_thread.start()
+            try:
+                await asyncio.to_thread(_get_pyaudio)
+            except Exception as e:
+                error_msg = f"Failed to initialize audio system: {str(e)}"
+                return {"success": False, "error": error_msg + _PLAYBACK_INIT_HINT}
 
+            device_info = None
+            if device_index is not None:
+                device_info = await asyncio.to_thread(_get_device_info, device_index)
+                if device_info["maxOutputChannels"] == 0:
                     return {
-                        "success": True,
-                        "file_played": file_path,
-                        "duration": duration,
-                        "sample_rate": sample_rate,
-                        "channels": channels,
-                        "device_used": device_info["name"]
-                        if device_info
-                        else "Default device",
-                        "status": "playing",
-                        "message": f"Audio playback started in background. Duration: {duration:.2f} seconds",
+                        "success": False,
+                        "error": f"Device {device_index} is not an output device",
                     }
-                except Exception as e:
-                    p.terminate()
-                    raise e
+            else:
+                device_info = await asyncio.to_thread(_get_default_device_info, False)
+                device_index = device_info["index"]
+
+            try:
+                stream = await asyncio.to_thread(
+                    _open_stream,
+                    format=_SAMPLE_FORMATS[sample_width],
+                    channels=channels,
+                    rate=sample_rate,
+                    output=True,
+                    frames_per_buffer=_PLAYBACK_CHUNK,
+                    output_device_index=device_index,
+                )
+            except Exception as e:
+                error_msg = f"Failed to open audio output stream: {str(e)}"
+                if "Invalid device" in str(e):
+                    _invalidate_device_cache()
+                    error_msg += f" Device index {device_index} may not exist or may not support playback."
+                elif "Device unavailable" in str(e) or "busy" in str(e).lower():
+                    error_msg += (
+                        " Audio device is currently in use by another application."
+                    )
+                elif _SYSTEM == "Linux" and "ALSA" in str(e):
+                    error_msg += " ALSA error - try different sample rate or check audio system configuration."
+                return {"success": False, "error": error_msg}
+
+            if volume == 100:
+                write = stream.write
+            else:
+                dtype = _SAMPLE_DTYPES[sample_width]
+                gain = volume / 100
+
+                def write(data):
+                    samples = np.frombuffer(data, dtype=dtype)
+                    stream.write((samples * gain).astype(dtype).tobytes())
+
+            def play_in_background():
+                try:
+                    chunk_bytes = _PLAYBACK_CHUNK * channels * sample_width
+                    if pcm is not None:
+                        # PyAudio's write only accepts read-only bytes, so the
+                        # chunks are plain bytes slices rather than memoryviews.
+                        for offset in range(0, len(pcm), chunk_bytes):
+                            write(pcm[offset : offset + chunk_bytes])
+                        return
+
+                    _stream_wav_data(write, wav_file, data_size, chunk_bytes)
+                finally:
+                    _close_stream(stream)
+
+            play_thread = threading.Thread(target=play_in_background)
+            play_thread.daemon = True
+            play_thread.start()
+            playing = True
+
+            return {
+                "success": True,
+                "file_played": file_path,
+                "duration": duration,
+                "sample_rate": sample_rate,
+                "channels": channels,
+                "device_used": device_info["name"] if device_info else "Default device",
+                "status": "playing",
+                "message": f"Audio playback started in background. Duration: {duration:.2f} seconds",
+            }
         except FileNotFoundError:
             return {
                 "success": False,
@@ -351,11 +745,14 @@ def register_tools(app: FastMCP) -> None:
             }
         except Exception as e:
             error_msg = f"Playback failed: {str(e)}"
-            if platform.system() == "Windows" and "DirectSound" in str(e):
+            if _SYSTEM == "Windows" and "DirectSound" in str(e):
                 error_msg += " Try updating your audio drivers or using a different audio device."
-            elif platform.system() == "Darwin" and "CoreAudio" in str(e):
+            elif _SYSTEM == "Darwin" and "CoreAudio" in str(e):
                 error_msg += " Check macOS audio settings and ensure the device is not in exclusive mode."
             return {"success": False, "error": error_msg}
+        finally:
+            if wav_file is not None and not playing:
+                wav_file.close()
 
     @app.tool(
         name="stop_record_audio",
@@ -365,31 +762,26 @@ def register_tools(app: FastMCP) -> None:
     async def stop_record_audio() -> Dict[str, Any]:
         global _active_audio_recording
 
-        if _active_audio_recording is None:
+        recording = _active_audio_recording
+        if recording is None:
             return {"success": False, "error": "No active audio recording found"}
+        if recording is _RECORDING_STARTING:
+            return {"success": False, "error": "Audio recording is still starting"}
+        _active_audio_recording = None
 
         try:
-            recording = _active_audio_recording
             recording["stop_event"].set()
-            recording["thread"].join(timeout=5.0)
-            recording["stream"].stop_stream()
-            recording["stream"].close()
+            await asyncio.to_thread(_stop_background_recording, recording)
 
             start_time = recording["start_time"]
-            duration = (datetime.datetime.now() - start_time).total_seconds()
+            duration = time.monotonic() - start_time
 
             output_file = recording["output_file"]
             try:
-                with wave.open(output_file, "wb") as wf:
-                    wf.setnchannels(recording["channels"])
-                    wf.setsampwidth(
-                        recording["pyaudio"].get_sample_size(recording["format"])
-                    )
-                    wf.setframerate(recording["sample_rate"])
-                    wf.writeframes(b"".join(recording["frames"]))
-
-                recording["pyaudio"].terminate()
-                _active_audio_recording = None
+                # Closing the writer patches the header with the final length.
+                await asyncio.to_thread(
+                    _close_wav_writer, recording["raw_file"], recording["wave_file"]
+                )
 
                 if os.path.exists(output_file) and os.path.getsize(output_file) > 0:
                     return {
@@ -413,7 +805,6 @@ def register_tools(app: FastMCP) -> None:
                     "error": f"Failed to save audio file: {str(e)}",
                 }
         except Exception as e:
-            _active_audio_recording = None
             return {
                 "success": False,
                 "error": f"Error stopping audio recording: {str(e)}",
@@ -1,5 +1,6 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
 from typing import Annotated
 from fastmcp import FastMCP
 from pydantic import Field
@@ -7,81 +8,539 @@ import cv2
 import os
 import tempfile
 import asyncio
+import collections
+import concurrent.futures
+import atexit
 import platform
+import shutil
 import subprocess
+import threading
+import time
+
+try:
+    from turbojpeg import TurboJPEG
+
+    _turbojpeg = TurboJPEG()
+except Exception:
+    # Optional: PyTurboJPEG and the libturbojpeg library it loads.
+    _turbojpeg = None
 
 _active_video_recording = None
+_RECORDING_STARTING = object()
 
+_FFMPEG_PATH = shutil.which("ffmpeg")
 
-def register_tools(app: FastMCP) -> None:
-    @app.tool(
-        name="list_cameras",
-        description="List all cameras connected to the system",
-        tags=["camera"],
-    )
-    async def list_cameras() -> List[Dict[str, str]]:
-        cameras = []
-        found_cameras = set()
+_PLATFORM = platform.system()
+_SYSTEM = _PLATFORM.lower()
+_TEMP_DIR = tempfile.gettempdir()
+_BACKENDS = {
+    "windows": (cv2.CAP_DSHOW, cv2.CAP_MSMF, cv2.CAP_ANY),
+    # GStreamer is left to CAP_ANY; probing it directly is slow and noisy.
+    "linux": (cv2.CAP_V4L2, cv2.CAP_ANY),
+    "darwin": (cv2.CAP_AVFOUNDATION, cv2.CAP_ANY),
+}.get(_SYSTEM, (cv2.CAP_ANY,))
 
-        for i in range(10):
-            if i in found_cameras:
-                continue
+_HW_H264_ENCODERS = {
+    "darwin": ["h264_videotoolbox"],
+    "windows": ["h264_nvenc", "h264_qsv"],
+    "linux": ["h264_nvenc", "h264_qsv"],
+}.get(_SYSTEM, [])
+_HW_ENCODER_BITRATE = "8M"
+# 4:2:0 nv12 moves a quarter less data per frame than the 4:2:2 formats and is
+# what the encoder converts to anyway.
+_AVFOUNDATION_PIXEL_FORMATS = ("nv12", "uyvy422", "yuyv422")
+_FFMPEG_ERROR_TAIL = 4096
+_FFMPEG_START_TIMEOUT = 2.0
+_FFMPEG_LOG_LINES = 64
 
-            cap = None
-            try:
-                cap = cv2.VideoCapture(i)
-                if cap.isOpened():
-                    ret, frame = cap.read()
-                    if ret and frame is not None:
-                        cameras.append(
-                            {
-                                "device_id": f"cam{i}",
-                                "name": f"Camera {i}",
-                                "backend": cap.getBackendName(),
-                            }
-                        )
-                        found_cameras.add(i)
-                        cap.release()
-                        continue
+_JPEG_QUALITY = 95
+_MAX_CAMERA_INDEX = 10
+_CAMERA_CACHE_TTL = 30.0
+_QUEUED_FRAME_SECONDS = 0.005
+_MJPG_BACKENDS = {cv2.CAP_V4L2, cv2.CAP_DSHOW}
+_MJPG_FOURCC = cv2.VideoWriter.fourcc(*"MJPG")
+_CAMERA_WORKER_IDLE_TIMEOUT = 60.0
+_CAMERA_WORKER_READ_TIMEOUT = 2.0
+_camera_cache = {
+    "ts": 0.0,
+    "data": None,
+    "listing": None,
+    "listing_source": None,
+    "scan": None,
+}
+_camera_cache_lock = threading.Lock()
+_camera_workers: Dict[int, "_CameraWorker"] = {}
+_camera_workers_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _get_h264_encoder() -> str:
+    """Pick a hardware H.264 encoder that actually works here, else libx264."""
+    try:
+        result = subprocess.run(
+            [_FFMPEG_PATH, "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+        available = result.stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return "libx264"
+
+    for encoder in _HW_H264_ENCODERS:
+        if f" {encoder} " not in available:
+            continue
+        # Builds list NVENC/QSV even without the hardware, so confirm with a
+        # one-frame encode before relying on it.
+        try:
+            result = subprocess.run(
+                [
+                    _FFMPEG_PATH,
+                    "-hide_banner",
+                    "-loglevel",
+                    "error",
+                    "-f",
+                    "lavfi",
+                    "-i",
+                    "color=size=256x256",
+                    "-frames:v",
+                    "1",
+                    "-c:v",
+                    encoder,
+                    "-f",
+                    "null",
+                    "-",
+                ],
+                capture_output=True,
+                timeout=10,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        if result.returncode == 0:
+            return encoder
+    return "libx264"
+
+
+@lru_cache(maxsize=32)
+def _get_avfoundation_pixel_format(
+    cam_index: int, width: int, height: int, fps: float
+) -> str:
+    """First AVFoundation pixel format this camera mode accepts, tried once."""
+    for pixel_format in _AVFOUNDATION_PIXEL_FORMATS:
+        try:
+            result = subprocess.run(
+                [
+                    _FFMPEG_PATH,
+                    "-hide_banner",
+                    "-loglevel",
+                    "error",
+                    "-f",
+                    "avfoundation",
+                    "-framerate",
+                    str(fps),
+                    "-video_size",
+                    f"{width}x{height}",
+                    "-pixel_format",
+                    pixel_format,
+                    "-i",
+                    str(cam_index),
+                    "-frames:v",
+                    "1",
+                    "-f",
+                    "null",
+                    "-",
+                ],
+                capture_output=True,
+                timeout=10,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            break
+        if result.returncode == 0:
+            return pixel_format
+    return "uyvy422"
+
+
+async def _wait_for_ffmpeg_output(
+    stderr: asyncio.StreamReader, log: collections.deque
+) -> bool:
+    """Read FFmpeg's log until it reports an opened output; False if it exits.
+
+    FFmpeg only logs "Output #" once the output file is open and the encoders
+    have initialised, so a bad path or a rejected encoder mode shows up as an
+    exit before it rather than mid-recording.
+    """
+    while True:
+        try:
+            line = await stderr.readline()
+        except ValueError:
+            # readline drops a line longer than the reader's limit; carry on.
+            continue
+        if not line:
+            return False
+        log.append(line)
+        if line.startswith(b"Output #"):
+            return True
+
+
+async def _drain_ffmpeg_log(
+    stderr: asyncio.StreamReader, log: collections.deque
+) -> None:
+    while True:
+        try:
+            line = await stderr.readline()
+        except ValueError:
+            continue
+        if not line:
+            return
+        log.append(line)
+
+
+def _index_plausible(cam_index: int) -> bool:
+    """Cheap pre-check that a camera index could exist at all."""
+    if _SYSTEM == "linux":
+        # One stat instead of failing an open on every backend in turn.
+        return os.path.exists(f"/dev/video{cam_index}")
+    # macOS and Windows have no device nodes to check without extra packages.
+    return True
+
+
+def _open_camera(cam_index: int) -> Optional[cv2.VideoCapture]:
+    """Open the first backend that delivers a frame; the caller releases it."""
+    if not _index_plausible(cam_index):
+        return None
+    backends = _BACKENDS
+    with _camera_cache_lock:
+        camera = (_camera_cache["data"] or {}).get(cam_index)
+    if camera is not None:
+        # Go straight to the backend that worked last time; the rest of the
+        # list is only tried if it has stopped working.
+        backends = (camera["api"],) + tuple(b for b in backends if b != camera["api"])
+
+    for backend in backends:
+        cap = None
+        try:
+            cap = cv2.VideoCapture(cam_index, backend)
+            if backend in _MJPG_BACKENDS:
+                # Many webcams default to YUYV, which caps high resolutions at a
+                # few fps; MJPG lets the camera compress and keeps full rate.
+                cap.set(cv2.CAP_PROP_FOURCC, _MJPG_FOURCC)
+            # Keep the driver queue to a single frame so reads aren't stale;
+            # backends that don't support it simply ignore the request.
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            # grab() proves the device delivers frames without decoding one.
+            if cap.isOpened() and cap.grab():
+                return cap
+            cap.release()
+        except Exception:
+            if cap:
                 cap.release()
+    return None
 
-                backends = [cv2.CAP_ANY]
-                system = platform.system().lower()
 
-                if system == "windows":
-                    backends = [cv2.CAP_DSHOW, cv2.CAP_MSMF] + backends
-                elif system == "darwin":
-                    backends = [cv2.CAP_AVFOUNDATION] + backends
-                elif system == "linux":
-                    backends = [cv2.CAP_V4L2, cv2.CAP_GSTREAMER] + backends
+def _read_latest(cap: cv2.VideoCapture, timeout: float = 1.0) -> Tuple[bool, Any]:
+    """Grab past any queued frames, then decode only the current one."""
+    deadline = time.monotonic() + timeout
+    grabbed = False
+    while time.monotonic() < deadline:
+        start = time.monotonic()
+        if not cap.grab():
+            break
+        grabbed = True
+        # Queued frames come back immediately; a grab that blocked waited for
+        # the sensor, so that frame is fresh.
+        if time.monotonic() - start > _QUEUED_FRAME_SECONDS:
+            break
+    if not grabbed:
+        return False, None
+    return cap.retrieve()
 
-                for backend in backends:
-                    try:
-                        cap = cv2.VideoCapture(i, backend)
-                        if cap.isOpened():
-                            ret, frame = cap.read()
-                            if ret and frame is not None:
-                                cameras.append(
-                                    {
-                                        "device_id": f"cam{i}",
-                                        "name": f"Camera {i}",
-                                        "backend": cap.getBackendName(),
-                                    }
-                                )
-                                found_cameras.add(i)
-                                cap.release()
-                                break
-                        cap.release()
-                    except Exception:
-                        if cap:
-                            cap.release()
-                        continue
-            except Exception:
-                if cap:
-                    cap.release()
-                continue
-
-        return cameras
+
+def _save_jpeg(path: str, frame: Any, quality: int = _JPEG_QUALITY) -> bool:
+    if _turbojpeg is not None:
+        # libjpeg-turbo's SIMD colour conversion and DCT encode several times
+        # faster than the libjpeg many OpenCV wheels ship with.
+        data = _turbojpeg.encode(frame, quality=quality)
+    else:
+        # Optimized Huffman tables shrink the file a few percent at no cost
+        # to the image.
+        ok, data = cv2.imencode(
+            ".jpg",
+            frame,
+            [cv2.IMWRITE_JPEG_QUALITY, quality, cv2.IMWRITE_JPEG_OPTIMIZE, 1],
+        )
+        if not ok:
+            return False
+
+    # Write beside the target and rename over it, so an interrupted save never
+    # leaves a truncated image at the requested path.
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+def _camera_info(cam_index: int, cap: cv2.VideoCapture) -> Dict[str, Any]:
+    return {
+        "index": cam_index,
+        "name": f"Camera {cam_index}",
+        "backend": cap.getBackendName(),
+        "api": int(cap.get(cv2.CAP_PROP_BACKEND)),
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fps": cap.get(cv2.CAP_PROP_FPS),
+    }
+
+
+def _probe_camera(cam_index: int) -> Optional[Dict[str, Any]]:
+    cap = _open_camera(cam_index)
+    if cap is None:
+        return None
+    try:
+        return _camera_info(cam_index, cap)
+    finally:
+        cap.release()
+
+
+def _remember_camera(info: Dict[str, Any]) -> None:
+    with _camera_cache_lock:
+        if _camera_cache["data"] is not None:
+            # Copy rather than mutate so a listing in progress isn't disturbed.
+            _camera_cache["data"] = {**_camera_cache["data"], info["index"]: info}
+
+
+async def _scan_cameras() -> Dict[int, Dict[str, Any]]:
+    # A streaming camera is held open by its worker and may refuse a second
+    # open, so use what the worker recorded when it opened instead of probing.
+    with _camera_workers_lock:
+        streaming = {i: worker.info for i, worker in _camera_workers.items()}
+
+    # A missing index can take a second or more to fail over every backend,
+    # so probe them side by side instead of one after another.
+    results = await asyncio.gather(
+        *(
+            asyncio.to_thread(_probe_camera, i)
+            for i in range(_MAX_CAMERA_INDEX)
+            if i not in streaming
+        )
+    )
+    cameras = {info["index"]: info for info in results if info is not None}
+    cameras.update(streaming)
+    return dict(sorted(cameras.items()))
+
+
+def _run_camera_scan(future: concurrent.futures.Future) -> None:
+    try:
+        cameras = asyncio.run(_scan_cameras())
+    except BaseException as e:
+        with _camera_cache_lock:
+            _camera_cache["scan"] = None
+        future.set_exception(e)
+        return
+    with _camera_cache_lock:
+        _camera_cache["data"] = cameras
+        _camera_cache["ts"] = time.monotonic()
+        _camera_cache["scan"] = None
+    future.set_result(cameras)
+
+
+def _start_camera_scan() -> concurrent.futures.Future:
+    """Return the camera scan in progress, starting one if there is none.
+
+    The caller holds _camera_cache_lock. The scan runs on its own thread and
+    event loop, so the startup warm-up and any client share the same one.
+    """
+    future = _camera_cache["scan"]
+    if future is None:
+        future = concurrent.futures.Future()
+        _camera_cache["scan"] = future
+        threading.Thread(
+            target=_run_camera_scan, args=(future,), name="camera-scan", daemon=True
+        ).start()
+    return future
+
+
+async def _get_cameras(refresh: bool = False) -> Dict[int, Dict[str, Any]]:
+    with _camera_cache_lock:
+        if (
+            not refresh
+            and _camera_cache["data"] is not None
+            and time.monotonic() - _camera_cache["ts"] < _CAMERA_CACHE_TTL
+        ):
+            return _camera_cache["data"]
+        # Overlapping scans would find each other's probes holding the
+        # devices and drop those cameras until the next refresh, so callers
+        # that arrive while one is running wait for it instead.
+        future = _start_camera_scan()
+    # Shielded so one caller cancelling doesn't fail the others.
+    return await asyncio.shield(asyncio.wrap_future(future))
+
+
+def _get_camera_listing(cameras: Dict[int, Dict[str, Any]]) -> List[Dict[str, str]]:
+    """The list_cameras payload, rebuilt only when the cached cameras change."""
+    with _camera_cache_lock:
+        # The cache replaces its dict on every change, so identity is enough.
+        if _camera_cache["listing_source"] is not cameras:
+            _camera_cache["listing"] = [
+                {
+                    "device_id": f"cam{i}",
+                    "name": info["name"],
+                    "backend": info["backend"],
+                }
+                for i, info in cameras.items()
+            ]
+            _camera_cache["listing_source"] = cameras
+        return _camera_cache["listing"]
+
+
+def _get_camera(cam_index: int) -> Optional[Dict[str, Any]]:
+    """Cached characteristics for one camera, probing it live on a miss."""
+    with _camera_cache_lock:
+        cameras = _camera_cache["data"]
+        if cameras is not None and cam_index in cameras:
+            return cameras[cam_index]
+    with _camera_workers_lock:
+        worker = _camera_workers.get(cam_index)
+    if worker is not None:
+        # The worker holds the device, so a probe could find it busy.
+        return worker.info
+
+    info = _probe_camera(cam_index)
+    if info is not None:
+        _remember_camera(info)
+    return info
+
+
+def warm_up_cameras() -> None:
+    """Probe every camera in the background so the first tool calls hit the cache.
+
+    Opening a camera for the first time pays for driver buffer allocation and
+    backend fallback; doing it at startup takes that off the first request.
+    """
+    with _camera_cache_lock:
+        _start_camera_scan()
+
+
+class _CameraWorker:
+    """Keeps a capture grabbing in the background so snapshots skip the open.
+
+    Only the worker thread touches the capture; latest() asks it to decode the
+    next grabbed frame. The worker releases the camera after sitting idle.
+    """
+
+    def __init__(self, cam_index: int, cap: cv2.VideoCapture):
+        self.cam_index = cam_index
+        # Read before the thread starts, as the capture is the worker's after.
+        self.info = _camera_info(cam_index, cap)
+        self._cap = cap
+        self._running = True
+        self._last_used = time.monotonic()
+        self._frame = (False, None)
+        self._request = threading.Event()
+        self._ready = threading.Event()
+        self._request_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while self._running:
+                if time.monotonic() - self._last_used > _CAMERA_WORKER_IDLE_TIMEOUT:
+                    break
+                if not self._cap.grab():
+                    break
+                if self._request.is_set():
+                    self._request.clear()
+                    self._frame = self._cap.retrieve()
+                    self._ready.set()
+        except Exception:
+            pass
+        finally:
+            self._running = False
+            self._ready.set()
+            self._cap.release()
+            with _camera_workers_lock:
+                if _camera_workers.get(self.cam_index) is self:
+                    del _camera_workers[self.cam_index]
+
+    def latest(self) -> Tuple[bool, Any]:
+        with self._request_lock:
+            self._last_used = time.monotonic()
+            self._frame = (False, None)
+            self._ready.clear()
+            self._request.set()
+            if not self._running:
+                return False, None
+            self._ready.wait(_CAMERA_WORKER_READ_TIMEOUT)
+            return self._frame
+
+    def stop(self) -> None:
+        self._running = False
+        self._thread.join(timeout=_CAMERA_WORKER_READ_TIMEOUT)
+
+
+def _get_camera_worker(cam_index: int) -> Optional[_CameraWorker]:
+    """The running worker for a camera, opening one if none is streaming."""
+    with _camera_workers_lock:
+        worker = _camera_workers.get(cam_index)
+    if worker is not None:
+        return worker
+
+    cap = _open_camera(cam_index)
+    if cap is None:
+        return None
+    with _camera_workers_lock:
+        existing = _camera_workers.get(cam_index)
+        if existing is None:
+            worker = _camera_workers[cam_index] = _CameraWorker(cam_index, cap)
+    if existing is None:
+        _remember_camera(worker.info)
+        return worker
+    # Another caller started a worker while this one was opening the device.
+    cap.release()
+    return existing
+
+
+def _stop_camera_worker(cam_index: int) -> None:
+    with _camera_workers_lock:
+        worker = _camera_workers.pop(cam_index, None)
+    if worker is not None:
+        worker.stop()
+
+
+@atexit.register
+def _stop_camera_workers() -> None:
+    with _camera_workers_lock:
+        workers = list(_camera_workers.values())
+        _camera_workers.clear()
+    for worker in workers:
+        worker.stop()
+
+
+def register_tools(app: FastMCP) -> None:
+    @app.tool(
+        name="list_cameras",
+        description="List all cameras connected to the system",
+        tags=["camera"],
+    )
+    async def list_cameras(
+        force_refresh: Annotated[
+            bool,
+            Field(
+                default=False,
+                description="Re-probe every camera instead of using the cached list",
+            ),
+        ] = False,
+    ) -> List[Dict[str, str]]:
+        cameras = await _get_cameras(force_refresh)
+        return _get_camera_listing(cameras)
 
     @app.tool(
         name="get_camera_info",
@@ -97,62 +556,32 @@ def register_tools(app: FastMCP) -> None:
             ),
         ] = "cam0",
     ) -> Dict[str, Any]:
-        cap = None
         try:
             if device_id.startswith("cam"):
                 cam_index = int(device_id[3:])
             else:
                 return {
                     "error": "Invalid device_id format",
-                    "platform": platform.system(),
+                    "platform": _PLATFORM,
                 }
 
-            system = platform.system().lower()
-            backends = []
-            if system == "windows":
-                backends = [cv2.CAP_DSHOW, cv2.CAP_MSMF, cv2.CAP_ANY]
-            elif system == "linux":
-                backends = [cv2.CAP_V4L2, cv2.CAP_GSTREAMER, cv2.CAP_ANY]
-            elif system == "darwin":
-                backends = [cv2.CAP_AVFOUNDATION, cv2.CAP_ANY]
-            else:
-                backends = [cv2.CAP_ANY]
-
-            for backend in backends:
-                try:
-                    cap = cv2.VideoCapture(cam_index, backend)
-                    if cap.isOpened():
-                        ret, frame = cap.read()
-                        if ret and frame is not None:
-                            break
-                        cap.release()
-                        cap = None
-                except Exception:
-                    if cap:
-                        cap.release()
-                        cap = None
-                    continue
-
-            if not cap or not cap.isOpened():
+            camera = await asyncio.to_thread(_get_camera, cam_index)
+            if camera is None:
                 return {
                     "device_id": device_id,
                     "status": "unavailable",
                     "error": "Camera not accessible",
-                    "platform": platform.system(),
+                    "platform": _PLATFORM,
                 }
 
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            backend = cap.getBackendName()
             info = {
                 "device_id": device_id,
-                "name": f"Camera {device_id[3:]}",
-                "resolution": f"{width}x{height}",
-                "fps": fps,
-                "backend": backend,
+                "name": camera["name"],
+                "resolution": f"{camera['width']}x{camera['height']}",
+                "fps": camera["fps"],
+                "backend": camera["backend"],
                 "status": "available",
-                "platform": platform.system(),
+                "platform": _PLATFORM,
             }
 
             return info
@@ -161,11 +590,8 @@ def register_tools(app: FastMCP) -> None:
                 "device_id": device_id,
                 "status": "error",
                 "error": str(e),
-                "platform": platform.system(),
+                "platform": _PLATFORM,
             }
-        finally:
-            if cap is not None:
-                cap.release()
 
     @app.tool(
         name="capture_image",
@@ -194,6 +620,22 @@ def register_tools(app: FastMCP) -> None:
                 description="The file path where the captured image should be saved. If None, a temporary file will be created automatically.",
             ),
         ] = None,
+        keep_open: Annotated[
+            bool,
+            Field(
+                default=False,
+                description="Keep the camera streaming in the background so later captures skip opening it. It is released after a minute without captures.",
+            ),
+        ] = False,
+        quality: Annotated[
+            int,
+            Field(
+                default=_JPEG_QUALITY,
+                ge=1,
+                le=100,
+                description="JPEG quality of the saved image; lower values give smaller files",
+            ),
+        ] = _JPEG_QUALITY,
     ) -> Dict[str, Any]:
         cap = None
         try:
@@ -202,44 +644,36 @@ def register_tools(app: FastMCP) -> None:
             else:
                 return {"error": "Invalid device_id format"}
 
-            system = platform.system().lower()
-            backends = []
-            if system == "windows":
-                backends = [cv2.CAP_DSHOW, cv2.CAP_MSMF, cv2.CAP_ANY]
-            elif system == "linux":
-                backends = [cv2.CAP_V4L2, cv2.CAP_GSTREAMER, cv2.CAP_ANY]
-            elif system == "darwin":
-                backends = [cv2.CAP_AVFOUNDATION, cv2.CAP_ANY]
-            else:
-                backends = [cv2.CAP_ANY]
+            with _camera_workers_lock:
+                worker = _camera_workers.get(cam_index)
+            if worker is None and keep_open:
+                worker = await asyncio.to_thread(_get_camera_worker, cam_index)
+                if worker is None:
+                    return {
+                        "status": "error",
+                        "device_id": device_id,
+                        "error": "Camera not accessible",
+                    }
 
-            for backend in backends:
-                try:
-                    cap = cv2.VideoCapture(cam_index, backend)
-                    if cap.isOpened():
-                        ret, frame = cap.read()
-                        if ret and frame is not None:
-                            break
-                        cap.release()
-                        cap = None
-                except Exception:
-                    if cap:
-                        cap.release()
-                        cap = None
-                    continue
+            if worker is not None:
+                await asyncio.sleep(timer)
+                ret, frame = await asyncio.to_thread(worker.latest)
+            else:
+                cap = await asyncio.to_thread(_open_camera, cam_index)
 
-            if not cap or not cap.isOpened():
-                return {
-                    "status": "error",
-                    "device_id": device_id,
-                    "error": "Camera not accessible",
-                }
+                if not cap or not cap.isOpened():
+                    return {
+                        "status": "error",
+                        "device_id": device_id,
+                        "error": "Camera not accessible",
+                    }
 
-            for _ in range(5):
-                cap.read()
+                # One grab covers backends that ignore CAP_PROP_BUFFERSIZE
+                # without paying for the decode of the discarded frame.
+                await asyncio.to_thread(cap.grab)
 
-            await asyncio.sleep(timer)
-            ret, frame = cap.read()
+                await asyncio.sleep(timer)
+                ret, frame = await asyncio.to_thread(_read_latest, cap)
 
             if not ret or frame is None:
                 return {
@@ -249,16 +683,17 @@ def register_tools(app: FastMCP) -> None:
                 }
 
             if save_path is None:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                temp_dir = tempfile.gettempdir()
-                save_path = os.path.join(temp_dir, f"camera_capture_{timestamp}.jpg")
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+                save_path = os.path.join(_TEMP_DIR, f"camera_capture_{timestamp}.jpg")
             elif os.path.isdir(save_path):
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
                 save_path = os.path.join(save_path, f"camera_capture_{timestamp}.jpg")
-
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            encode_params = [cv2.IMWRITE_JPEG_QUALITY, 95]
-            success = cv2.imwrite(save_path, frame, encode_params)
+            else:
+                # Only a caller-supplied file path can name a missing directory.
+                save_dir = os.path.dirname(save_path)
+                if save_dir:
+                    os.makedirs(save_dir, exist_ok=True)
+            success = await asyncio.to_thread(_save_jpeg, save_path, frame, quality)
             if not success:
                 return {
                     "status": "error",
@@ -275,7 +710,7 @@ def register_tools(app: FastMCP) -> None:
             return {"status": "error", "device_id": device_id, "error": str(e)}
         finally:
             if cap is not None:
-                cap.release()
+                await asyncio.to_thread(cap.release)
 
     @app.tool(
         name="start_video_recording",
@@ -342,42 +777,18 @@ def register_tools(app: FastMCP) -> None:
             if fps <= 0:
                 return {"status": "error", "error": "FPS must be positive"}
 
-            system = platform.system().lower()
-            if system == "darwin" and fps > 30:
+            if _SYSTEM == "darwin" and fps > 30:
                 return {
                     "status": "error",
                     "error": "FPS cannot exceed 30 for macOS cameras. Use fps=30 or lower.",
                 }
 
-            cap = None
             width, height = None, None
-            backends = []
-            if system == "windows":
-                backends = [cv2.CAP_DSHOW, cv2.CAP_MSMF, cv2.CAP_ANY]
-            elif system == "linux":
-                backends = [cv2.CAP_V4L2, cv2.CAP_GSTREAMER, cv2.CAP_ANY]
-            elif system == "darwin":
-                backends = [cv2.CAP_AVFOUNDATION, cv2.CAP_ANY]
-            else:
-                backends = [cv2.CAP_ANY]
-
-            for backend in backends:
-                try:
-                    cap = cv2.VideoCapture(cam_index, backend)
-                    if cap.isOpened():
-                        ret, frame = cap.read()
-                        if ret and frame is not None:
-                            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                            cap.release()
-                            break
-                        cap.release()
-                        cap = None
-                except Exception:
-                    if cap:
-                        cap.release()
-                        cap = None
-                    continue
+            # A cached resolution means the device needn't be opened here only
+            # to be released and initialised again by FFmpeg.
+            camera = await asyncio.to_thread(_get_camera, cam_index)
+            if camera is not None:
+                width, height = camera["width"], camera["height"]
 
             if width is None or height is None:
                 return {
@@ -385,30 +796,24 @@ def register_tools(app: FastMCP) -> None:
                     "error": "Could not determine camera resolution",
                 }
 
+            # FFmpeg needs the device to itself.
+            await asyncio.to_thread(_stop_camera_worker, cam_index)
+
             if save_path is None:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                temp_dir = tempfile.gettempdir()
-                save_path = os.path.join(temp_dir, f"camera_recording_{timestamp}.mp4")
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+                save_path = os.path.join(_TEMP_DIR, f"camera_recording_{timestamp}.mp4")
             elif os.path.isdir(save_path):
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
                 save_path = os.path.join(save_path, f"camera_recording_{timestamp}.mp4")
-
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
+            else:
+                # Only a caller-supplied file path can name a missing directory.
+                save_dir = os.path.dirname(save_path)
+                if save_dir:
+                    os.makedirs(save_dir, exist_ok=True)
 
             await asyncio.sleep(timer)
 
-            try:
-                result = subprocess.run(
-                    ["ffmpeg", "-version"], capture_output=True, text=True, timeout=10
-                )
-                if result.returncode != 0:
-                    raise FileNotFoundError("FFmpeg not found or not working")
-            except (
-                subprocess.TimeoutExpired,
-                subprocess.CalledProcessError,
-                FileNotFoundError,
-            ):
-                system = platform.system()
+            if _FFMPEG_PATH is None:
                 install_commands = {
                     "Windows": "winget install ffmpeg  OR  download from https://ffmpeg.org/",
                     "Darwin": "brew install ffmpeg",
@@ -416,12 +821,14 @@ def register_tools(app: FastMCP) -> None:
                 }
                 return {
                     "success": False,
-                    "error": f"Screen recording requires FFmpeg. Install it using: {install_commands.get(system, 'ffmpeg')}",
+                    "error": f"Screen recording requires FFmpeg. Install it using: {install_commands.get(_PLATFORM, 'ffmpeg')}",
                 }
 
-            ffmpeg_args = ["ffmpeg", "-y"]
+            # -nostats keeps FFmpeg from logging a progress line per frame
+            # batch for the whole recording.
+            ffmpeg_args = [_FFMPEG_PATH, "-y", "-nostats"]
 
-            if system == "windows":
+            if _SYSTEM == "windows":
                 ffmpeg_args.extend(
                     [
                         "-f",
@@ -434,7 +841,7 @@ def register_tools(app: FastMCP) -> None:
                         f"video=@device_pv_{cam_index}",
                     ]
                 )
-            elif system == "linux":
+            elif _SYSTEM == "linux":
                 ffmpeg_args.extend(
                     [
                         "-f",
@@ -447,7 +854,10 @@ def register_tools(app: FastMCP) -> None:
                         f"/dev/video{cam_index}",
                     ]
                 )
-            elif system == "darwin":
+            elif _SYSTEM == "darwin":
+                pixel_format = await asyncio.to_thread(
+                    _get_avfoundation_pixel_format, cam_index, width, height, fps
+                )
                 ffmpeg_args.extend(
                     [
                         "-f",
@@ -457,7 +867,7 @@ def register_tools(app: FastMCP) -> None:
                         "-video_size",
                         f"{width}x{height}",
                         "-pixel_format",
-                        "uyvy422",
+                        pixel_format,
                         "-i",
                         str(cam_index),
                     ]
@@ -474,18 +884,32 @@ def register_tools(app: FastMCP) -> None:
                     ]
                 )
 
-            ffmpeg_args.extend(
-                [
-                    "-vcodec",
-                    "libx264",
-                    "-pix_fmt",
-                    "yuv420p",
-                    "-crf",
-                    "23",
-                    "-preset",
-                    "superfast" if duration == -1 else "fast",
-                ]
-            )
+            encoder = await asyncio.to_thread(_get_h264_encoder)
+            if encoder == "libx264":
+                ffmpeg_args.extend(
+                    [
+                        "-vcodec",
+                        "libx264",
+                        "-pix_fmt",
+                        "yuv420p",
+                        "-crf",
+                        "23",
+                        "-preset",
+                        "superfast" if duration == -1 else "fast",
+                    ]
+                )
+            else:
+                # Hardware encoders don't take libx264's -crf/-preset.
+                ffmpeg_args.extend(
+                    [
+                        "-vcodec",
+                        encoder,
+                        "-pix_fmt",
+                        "nv12" if encoder == "h264_qsv" else "yuv420p",
+                        "-b:v",
+                        _HW_ENCODER_BITRATE,
+                    ]
+                )
 
             if duration != -1:
                 ffmpeg_args.extend(["-t", str(duration)])
@@ -493,34 +917,61 @@ def register_tools(app: FastMCP) -> None:
             ffmpeg_args.append(save_path)
 
             if duration == -1:
-                proc = subprocess.Popen(
-                    ffmpeg_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                _active_video_recording = {
-                    "process": proc,
-                    "file_path": save_path,
-                    "device_id": device_id,
-                    "start_time": datetime.now(),
-                }
-
-                await asyncio.sleep(0.5)
+                if _active_video_recording is not None:
+                    return {
+                        "status": "error",
+                        "error": "Another video recording is already in progress. Stop it first using stop_video_recording.",
+                    }
+                # Hold the slot until FFmpeg is up, so a stop or another start
+                # in the meantime sees the recording as starting.
+                _active_video_recording = _RECORDING_STARTING
+                try:
+                    proc = await asyncio.create_subprocess_exec(
+                        *ffmpeg_args,
+                        stdout=asyncio.subprocess.DEVNULL,
+                        stderr=asyncio.subprocess.PIPE,
+                    )
+                    log = collections.deque(maxlen=_FFMPEG_LOG_LINES)
 
-                if proc.poll() is not None:
-                    _active_video_recording = None
+                    # FFmpeg logs the opened output as soon as the camera and
+                    # encoder are up, or exits with its error; no fixed sleep.
                     try:
-                        stdout, stderr = proc.communicate()
-                        error_msg = stderr.decode() if stderr else "Unknown error"
+                        started = await asyncio.wait_for(
+                            _wait_for_ffmpeg_output(proc.stderr, log),
+                            timeout=_FFMPEG_START_TIMEOUT,
+                        )
+                    except asyncio.TimeoutError:
+                        started = proc.returncode is None
+                    except BaseException:
+                        proc.kill()
+                        await proc.wait()
+                        raise
 
+                    if not started:
+                        await proc.wait()
+                        error_msg = b"".join(log)[-_FFMPEG_ERROR_TAIL:].decode(
+                            errors="replace"
+                        )
                         return {
                             "status": "error",
-                            "error": f"Recording failed to start: {error_msg}",
-                        }
-                    except Exception as e:
-                        return {
-                            "status": "error",
-                            "error": f"Recording failed to start: {str(e)}",
+                            "error": f"Recording failed to start: {error_msg or 'Unknown error'}",
                         }
 
+                    _active_video_recording = {
+                        "process": proc,
+                        "file_path": save_path,
+                        "device_id": device_id,
+                        "start_time": datetime.now(),
+                        # Keep reading so warnings can't fill the pipe and
+                        # stall FFmpeg.
+                        "log_task": asyncio.create_task(
+                            _drain_ffmpeg_log(proc.stderr, log)
+                        ),
+                    }
+                finally:
+                    if _active_video_recording is _RECORDING_STARTING:
+                        _active_video_recording = None
+
                 return {
                     "status": "success",
                     "device_id": device_id,
@@ -530,10 +981,21 @@ def register_tools(app: FastMCP) -> None:
                     "message": "Background recording started. Use stop_video_recording to stop.",
                 }
 
-            result = subprocess.run(ffmpeg_args, capture_output=True, text=True)
+            proc = await asyncio.create_subprocess_exec(
+                *ffmpeg_args,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                _, stderr = await proc.communicate()
+            except asyncio.CancelledError:
+                proc.kill()
+                await proc.wait()
+                raise
 
-            if result.returncode != 0:
-                error_msg = result.stderr
+            if proc.returncode != 0:
+                # The tail holds the actual failure; the rest is banner.
+                error_msg = stderr[-_FFMPEG_ERROR_TAIL:].decode(errors="replace")
                 return {
                     "status": "error",
                     "device_id": device_id,
@@ -570,6 +1032,8 @@ def register_tools(app: FastMCP) -> None:
 
         if _active_video_recording is None:
             return {"status": "error", "error": "No active video recording found"}
+        if _active_video_recording is _RECORDING_STARTING:
+            return {"status": "error", "error": "Video recording is still starting"}
 
         try:
             process = _active_video_recording["process"]
@@ -579,10 +1043,11 @@ def register_tools(app: FastMCP) -> None:
 
             process.terminate()
             try:
-                process.wait(timeout=10)
-            except subprocess.TimeoutExpired:
+                await asyncio.wait_for(process.wait(), timeout=10)
+            except asyncio.TimeoutError:
                 process.kill()
-                process.wait()
+                await process.wait()
+            await _active_video_recording["log_task"]
 
             _active_video_recording = None
 
@@ -1,15 +1,249 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from fastmcp import FastMCP
 from typing import Annotated
 from pydantic import Field
 from datetime import datetime
 import platform
+import asyncio
 import subprocess
 import tempfile
+import time
+import csv
+import io
 import re
+import shutil
 import os
 
 
+_IS_WINDOWS = platform.system() == "Windows"
+
+if _IS_WINDOWS:
+    try:
+        import win32print
+    except ImportError:
+        # Optional: pywin32 talks to the spooler directly, otherwise use wmic.
+        win32print = None
+else:
+    win32print = None
+
+_WIN32_ERRORS = (win32print.error,) if win32print is not None else ()
+
+_HAS_LP = shutil.which("lp") is not None
+_HAS_LPSTAT = shutil.which("lpstat") is not None
+_HAS_LPOPTIONS = shutil.which("lpoptions") is not None
+_HAS_CANCEL = shutil.which("cancel") is not None
+_NO_CUPS_ERROR = "CUPS is not installed"
+
+_RE_ENABLED_PRINTER = re.compile(r"^printer (\S+).*enabled", re.MULTILINE)
+_RE_DEFAULT = re.compile(r"system default destination: (\S+)")
+_RE_LP_JOB = re.compile(r"request id is (\S+)")
+_RE_WIN_JOB = re.compile(r"job-id:(\S+)")
+_RE_JOBINFO = re.compile(r"(\S+)\s+\S+\s+(\d+)\s+(\d+)")
+
+_MAX_CONCURRENT_COMMANDS = 8
+_COMMAND_TIMEOUT = 30.0
+_command_slots = asyncio.Semaphore(_MAX_CONCURRENT_COMMANDS)
+
+_DEFAULT_PRINTER_TTL = 30.0
+_default_printer_cache = {"ts": 0.0, "name": None}
+
+_PRINT_JOBS_TTL = 0.5
+_print_jobs_cache = {"ts": 0.0, "jobs": {}, "task": None}
+
+
+def _wmic_rows(output: str) -> List[List[str]]:
+    """Parse ``wmic ... /format:csv`` output into rows, without the header."""
+    rows = [row for row in csv.reader(io.StringIO(output.strip())) if row]
+    return rows[1:]
+
+
+async def _missing_command(name: str) -> subprocess.CompletedProcess:
+    raise FileNotFoundError(name)
+
+
+async def _run(
+    cmd: List[str], input: Optional[bytes] = None
+) -> subprocess.CompletedProcess:
+    """Run a command without blocking the event loop, raising on failure."""
+    async with _command_slots:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE if input is not None else None,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                proc.communicate(input), _COMMAND_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            # Report a hung spooler command like any other failed one.
+            proc.kill()
+            await proc.wait()
+            stdout = b""
+            stderr = f"{cmd[0]} timed out after {_COMMAND_TIMEOUT:g}s".encode()
+        except asyncio.CancelledError:
+            proc.kill()
+            raise
+    result = subprocess.CompletedProcess(
+        cmd,
+        proc.returncode,
+        stdout.decode(errors="replace"),
+        stderr.decode(errors="replace"),
+    )
+    result.check_returncode()
+    return result
+
+
+def _win32_printer_names() -> List[str]:
+    flags = win32print.PRINTER_ENUM_LOCAL | win32print.PRINTER_ENUM_CONNECTIONS
+    return [printer[2] for printer in win32print.EnumPrinters(flags, None, 1)]
+
+
+def _win32_find_job(job_id: int) -> Optional[Tuple[str, Dict[str, Any]]]:
+    for name in _win32_printer_names():
+        handle = win32print.OpenPrinter(name)
+        try:
+            for job in win32print.EnumJobs(handle, 0, -1, 1):
+                if job["JobId"] == job_id:
+                    return name, job
+        finally:
+            win32print.ClosePrinter(handle)
+    return None
+
+
+def _win32_cancel_job(job_id: int) -> bool:
+    found = _win32_find_job(job_id)
+    if found is None:
+        return False
+    handle = win32print.OpenPrinter(found[0])
+    try:
+        win32print.SetJob(handle, job_id, 0, None, win32print.JOB_CONTROL_DELETE)
+    finally:
+        win32print.ClosePrinter(handle)
+    return True
+
+
+async def _lookup_default_printer() -> Optional[str]:
+    if win32print is not None:
+        try:
+            return await asyncio.to_thread(win32print.GetDefaultPrinter)
+        except win32print.error:
+            return None
+
+    if _IS_WINDOWS:
+        result = await _run(
+            [
+                "wmic",
+                "printer",
+                "where",
+                "default=true",
+                "get",
+                "name",
+                "/format:csv",
+            ]
+        )
+        for row in _wmic_rows(result.stdout):
+            if len(row) >= 2 and row[1].strip():
+                return row[1].strip()
+        return None
+
+    # Unix/Linux/macOS: Try multiple methods to get default printer
+    if _HAS_LPSTAT:
+        try:
+            result = await _run(["lpstat", "-d"])
+            match = _RE_DEFAULT.search(result.stdout)
+            if match:
+                return match.group(1)
+        except subprocess.CalledProcessError:
+            pass
+
+    # Fallback: try lpoptions to get default printer
+    if not _HAS_LPOPTIONS:
+        return None
+    try:
+        result = await _run(["lpoptions", "-d"])
+    except subprocess.CalledProcessError:
+        return None
+    parts = result.stdout.strip().split()
+    return parts[1] if len(parts) >= 2 else None
+
+
+async def _get_default_printer() -> Optional[str]:
+    if (
+        _default_printer_cache["name"] is not None
+        and time.monotonic() - _default_printer_cache["ts"] < _DEFAULT_PRINTER_TTL
+    ):
+        return _default_printer_cache["name"]
+
+    name = await _lookup_default_printer()
+    if name:
+        _default_printer_cache["name"] = name
+        _default_printer_cache["ts"] = time.monotonic()
+    return name
+
+
+def _invalidate_default_printer() -> None:
+    _default_printer_cache["name"] = None
+    _default_printer_cache["ts"] = 0.0
+
+
+def _write_pdf(path: str, data: bytes) -> None:
+    output_dir = os.path.dirname(path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+    with open(path, "wb") as pdf_file:
+        pdf_file.write(data)
+
+
+async def _refresh_print_jobs() -> Dict[str, str]:
+    result = await _run(["lpstat", "-W", "not-completed", "-o"])
+    jobs = {}
+    for line in result.stdout.strip().split("\n"):
+        if line.strip():
+            jobs[line.split()[0]] = line.strip()
+    _print_jobs_cache["jobs"] = jobs
+    _print_jobs_cache["ts"] = time.monotonic()
+    return jobs
+
+
+async def _get_print_jobs() -> Dict[str, str]:
+    """Return ``lpstat`` lines for all pending jobs, keyed by job id.
+
+    One listing serves every get_print_job call within the TTL, and callers
+    that arrive while it is running share the same lpstat process.
+    """
+    if time.monotonic() - _print_jobs_cache["ts"] < _PRINT_JOBS_TTL:
+        return _print_jobs_cache["jobs"]
+
+    task = _print_jobs_cache["task"]
+    if task is None:
+        task = asyncio.ensure_future(_refresh_print_jobs())
+        _print_jobs_cache["task"] = task
+        task.add_done_callback(lambda _: _print_jobs_cache.update(task=None))
+    # Shielded so one caller cancelling doesn't fail the others.
+    return await asyncio.shield(task)
+
+
+def _find_print_job(jobs: Dict[str, str], job_id: str) -> Optional[str]:
+    """The ``lpstat`` line for job_id, matched the way ``lpstat -o`` does.
+
+    Accepts a full ``queue-N`` id, a bare job number ``N``, or a queue name,
+    which matches that queue's first pending job.
+    """
+    if job_id in jobs:
+        return jobs[job_id]
+    for key, line in jobs.items():
+        queue, _, number = key.rpartition("-")
+        if job_id in (number, queue):
+            return line
+    return None
+
+
+def _invalidate_print_jobs() -> None:
+    _print_jobs_cache["ts"] = 0.0
+
+
 def register_tools(app: FastMCP) -> None:
     @app.tool(
         description="List all printers available on the system",
@@ -18,53 +252,40 @@ def register_tools(app: FastMCP) -> None:
     async def list_printers() -> List[Dict[str, str]]:
         printers = []
         try:
-            if platform.system() == "Windows":
-                result = subprocess.run(
-                    ["wmic", "printer", "get", "name", "/format:csv"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-                lines = result.stdout.strip().split("\n")[1:]
-                for line in lines:
-                    if line.strip() and "," in line:
-                        parts = line.split(",")
-                        if len(parts) >= 2 and parts[1].strip():
-                            printer_name = parts[1].strip()
-                            printers.append({"printer_name": printer_name})
+            if win32print is not None:
+                names = await asyncio.to_thread(_win32_printer_names)
+                printers = [{"printer_name": name} for name in names]
+            elif _IS_WINDOWS:
+                result = await _run(["wmic", "printer", "get", "name", "/format:csv"])
+                for row in _wmic_rows(result.stdout):
+                    if len(row) >= 2 and row[1].strip():
+                        printer_name = row[1].strip()
+                        printers.append({"printer_name": printer_name})
             else:
-                # Unix/Linux/macOS: Try lpstat first, fallback to other methods
-                try:
-                    result = subprocess.run(
-                        ["lpstat", "-p"], capture_output=True, text=True, check=True
-                    )
-                    printer_lines = result.stdout.strip().split("\n")
-
-                    for line in printer_lines:
-                        if line.startswith("printer ") and "enabled" in line:
-                            match = re.match(r"printer (\S+)", line)
-                            if match:
-                                printer_name = match.group(1)
-                                printers.append({"printer_name": printer_name})
-
-                except subprocess.CalledProcessError:
-                    # Fallback: try lpoptions (available on some Linux systems)
-                    try:
-                        result = subprocess.run(
-                            ["lpoptions", "-d"],
-                            capture_output=True,
-                            text=True,
-                            check=True,
-                        )
-                        # lpoptions output: "destination printer-name options"
-                        if result.stdout.strip():
-                            parts = result.stdout.strip().split()
-                            if len(parts) >= 2:
-                                printer_name = parts[1]
-                                printers.append({"printer_name": printer_name})
-                    except subprocess.CalledProcessError:
-                        pass  # No printers found or CUPS not available
-        except subprocess.CalledProcessError:
+                # Unix/Linux/macOS: Try lpstat first, fallback to lpoptions
+                # (available on some Linux systems). Both run at once so the
+                # fallback doesn't add a second round trip.
+                lpstat, lpoptions = await asyncio.gather(
+                    _run(["lpstat", "-p"])
+                    if _HAS_LPSTAT
+                    else _missing_command("lpstat"),
+                    _run(["lpoptions", "-d"])
+                    if _HAS_LPOPTIONS
+                    else _missing_command("lpoptions"),
+                    return_exceptions=True,
+                )
+                if not isinstance(lpstat, Exception):
+                    printers = [
+                        {"printer_name": match.group(1)}
+                        for match in _RE_ENABLED_PRINTER.finditer(lpstat.stdout)
+                    ]
+
+                if not printers and not isinstance(lpoptions, Exception):
+                    # lpoptions output: "destination printer-name options"
+                    parts = lpoptions.stdout.strip().split()
+                    if len(parts) >= 2:
+                        printers.append({"printer_name": parts[1]})
+        except (subprocess.CalledProcessError, *_WIN32_ERRORS):
             printers = []
         return printers
 
@@ -89,149 +310,89 @@ def register_tools(app: FastMCP) -> None:
         double_sided: Annotated[bool, Field(description="Print double-sided")] = False,
         color: Annotated[bool, Field(description="Print in color")] = False,
     ) -> Dict[str, Any]:
+        if not _IS_WINDOWS and not _HAS_LP:
+            return {"success": False, "error": _NO_CUPS_ERROR}
+
         if printer_name is None:
             try:
-                if platform.system() == "Windows":
-                    result = subprocess.run(
-                        [
-                            "wmic",
-                            "printer",
-                            "where",
-                            "default=true",
-                            "get",
-                            "name",
-                            "/format:csv",
-                        ],
-                        capture_output=True,
-                        text=True,
-                        check=True,
-                    )
-                    lines = result.stdout.strip().split("\n")[1:]
-                    for line in lines:
-                        if line.strip() and "," in line:
-                            parts = line.split(",")
-                            if len(parts) >= 2 and parts[1].strip():
-                                printer_name = parts[1].strip()
-                                break
-                    if not printer_name:
-                        return {"success": False, "error": "No default printer found"}
-                else:
-                    # Unix/Linux/macOS: Try multiple methods to get default printer
-                    try:
-                        result = subprocess.run(
-                            ["lpstat", "-d"], capture_output=True, text=True, check=True
-                        )
-                        match = re.search(
-                            r"system default destination: (\S+)", result.stdout
-                        )
-                        if match:
-                            printer_name = match.group(1)
-                        else:
-                            raise subprocess.CalledProcessError(1, "lpstat")
-                    except subprocess.CalledProcessError:
-                        # Fallback: try lpoptions to get default printer
-                        try:
-                            result = subprocess.run(
-                                ["lpoptions", "-d"],
-                                capture_output=True,
-                                text=True,
-                                check=True,
-                            )
-                            if result.stdout.strip():
-                                parts = result.stdout.strip().split()
-                                if len(parts) >= 2:
-                                    printer_name = parts[1]
-                                else:
-                                    return {
-                                        "success": False,
-                                        "error": "No default printer found",
-                                    }
-                            else:
-                                return {
-                                    "success": False,
-                                    "error": "No default printer found",
-                                }
-                        except subprocess.CalledProcessError:
-                            return {
-                                "success": False,
-                                "error": "No default printer found",
-                            }
+                printer_name = await _get_default_printer()
             except subprocess.CalledProcessError:
                 return {"success": False, "error": "Failed to retrieve default printer"}
+            if not printer_name:
+                return {"success": False, "error": "No default printer found"}
+
+        file_path = None
+        try:
+            if _IS_WINDOWS:
+                # Start-Process hands the print verb a path, so Windows still
+                # needs the data on disk.
+                with tempfile.NamedTemporaryFile(
+                    delete=False, suffix=f".{file_format}"
+                ) as temp_file:
+                    file_path = temp_file.name
+                    await asyncio.to_thread(temp_file.write, file_data)
 
-        with tempfile.NamedTemporaryFile(
-            delete=False, suffix=f".{file_format}"
-        ) as temp_file:
-            temp_file.write(file_data)
-            temp_file.flush()
-            file_path = temp_file.name
+                powershell_command = [
+                    "powershell",
+                    "-Command",
+                    f'$job = Start-Process -FilePath "{file_path}" -Verb Print -PassThru -WindowStyle Hidden; Write-Host "job-id:$($job.Id)"',
+                ]
 
-            try:
-                if platform.system() == "Windows":
+                if printer_name:
                     powershell_command = [
                         "powershell",
                         "-Command",
-                        f'$job = Start-Process -FilePath "{file_path}" -Verb Print -PassThru -WindowStyle Hidden; Write-Host "job-id:$($job.Id)"',
+                        f'$printer = Get-WmiObject -Class Win32_Printer | Where-Object {{$_.Name -eq "{printer_name}"}}; if ($printer) {{ $job = ([System.Diagnostics.Process]::Start([System.Diagnostics.ProcessStartInfo]@{{FileName="{file_path}"; Verb="Print"; UseShellExecute=$true; WindowStyle="Hidden"}})); Start-Sleep -Milliseconds 500; Write-Host "job-id:win-$($job.Id)" }} else {{ Write-Error "Printer not found" }}',
                     ]
 
-                    if printer_name:
-                        powershell_command = [
-                            "powershell",
-                            "-Command",
-                            f'$printer = Get-WmiObject -Class Win32_Printer | Where-Object {{$_.Name -eq "{printer_name}"}}; if ($printer) {{ $job = ([System.Diagnostics.Process]::Start([System.Diagnostics.ProcessStartInfo]@{{FileName="{file_path}"; Verb="Print"; UseShellExecute=$true; WindowStyle="Hidden"}})); Start-Sleep -Milliseconds 500; Write-Host "job-id:win-$($job.Id)" }} else {{ Write-Error "Printer not found" }}',
-                        ]
-
-                    result = subprocess.run(
-                        powershell_command,
-                        capture_output=True,
-                        text=True,
-                        check=True,
-                    )
-
-                    job_id_match = re.search(r"job-id:(\S+)", result.stdout)
-                    if job_id_match:
-                        job_id = job_id_match.group(1)
-                        return {
-                            "success": True,
-                            "job_id": job_id,
-                            "printer": printer_name or "default",
-                        }
-                    else:
-                        return {
-                            "success": False,
-                            "error": "Failed to retrieve print job ID from Windows",
-                        }
+                result = await _run(powershell_command)
+
+                job_id_match = _RE_WIN_JOB.search(result.stdout)
+                if job_id_match:
+                    job_id = job_id_match.group(1)
+                    return {
+                        "success": True,
+                        "job_id": job_id,
+                        "printer": printer_name or "default",
+                    }
                 else:
-                    lp_command = ["lp", "-d", printer_name, "-n", str(copies)]
-                    if double_sided:
-                        lp_command.append("-o")
-                        lp_command.append("sides=two-sided-long-edge")
-                    if not color:
-                        lp_command.append("-o")
-                        lp_command.append("ColorModel=Gray")
-                    lp_command.append(file_path)
-
-                    result = subprocess.run(
-                        lp_command, capture_output=True, text=True, check=True
-                    )
-                    job_id_match = re.search(r"request id is (\S+)", result.stdout)
-                    if job_id_match:
-                        job_id = job_id_match.group(1)
-                        return {
-                            "success": True,
-                            "job_id": job_id,
-                            "printer": printer_name,
-                        }
-                    else:
-                        return {
-                            "success": False,
-                            "error": "Failed to retrieve print job ID",
-                        }
-            except subprocess.CalledProcessError as e:
-                return {"success": False, "error": f"Printing failed: {e.stderr}"}
-            except Exception as e:
-                return {"success": False, "error": f"Unexpected error: {str(e)}"}
-            finally:
+                    return {
+                        "success": False,
+                        "error": "Failed to retrieve print job ID from Windows",
+                    }
+            else:
+                lp_command = ["lp", "-d", printer_name, "-n", str(copies)]
+                if double_sided:
+                    lp_command.append("-o")
+                    lp_command.append("sides=two-sided-long-edge")
+                if not color:
+                    lp_command.append("-o")
+                    lp_command.append("ColorModel=Gray")
+
+                # With no file argument lp reads the job from stdin.
+                result = await _run(lp_command, input=file_data)
+                _invalidate_print_jobs()
+                job_id_match = _RE_LP_JOB.search(result.stdout)
+                if job_id_match:
+                    job_id = job_id_match.group(1)
+                    return {
+                        "success": True,
+                        "job_id": job_id,
+                        "printer": printer_name,
+                    }
+                else:
+                    return {
+                        "success": False,
+                        "error": "Failed to retrieve print job ID",
+                    }
+        except subprocess.CalledProcessError as e:
+            # The default may have changed or been removed since it was cached.
+            _invalidate_default_printer()
+            return {"success": False, "error": f"Printing failed: {e.stderr}"}
+        except Exception as e:
+            return {"success": False, "error": f"Unexpected error: {str(e)}"}
+        finally:
+            if file_path is not None:
                 try:
                     os.unlink(file_path)
                 except OSError:
@@ -261,12 +422,8 @@ def register_tools(app: FastMCP) -> None:
                 full_output_path = os.path.join(output_path, filename)
             else:
                 full_output_path = output_path
-                output_dir = os.path.dirname(full_output_path)
-                if output_dir and not os.path.exists(output_dir):
-                    os.makedirs(output_dir, exist_ok=True)
 
-            with open(full_output_path, "wb") as pdf_file:
-                pdf_file.write(file_data)
+            await asyncio.to_thread(_write_pdf, full_output_path, file_data)
 
             return {"success": True, "output_path": full_output_path}
         except OSError as e:
@@ -281,8 +438,26 @@ def register_tools(app: FastMCP) -> None:
     )
     async def get_print_job(job_id: str) -> Dict[str, Any]:
         try:
-            if platform.system() == "Windows":
-                result = subprocess.run(
+            if win32print is not None:
+                found = None
+                if job_id.isdigit():
+                    found = await asyncio.to_thread(_win32_find_job, int(job_id))
+                if found is None:
+                    return {"success": False, "error": "No such job found"}
+                printer_name, job = found
+                pages_printed = job["PagesPrinted"]
+                total_pages = job["TotalPages"]
+                progress = (pages_printed / total_pages) * 100 if total_pages > 0 else 0
+                return {
+                    "job_id": job_id,
+                    "printer": printer_name,
+                    "status": "printing",
+                    "progress": f"{progress:.2f}%",
+                    "pages_printed": pages_printed,
+                    "total_pages": total_pages,
+                }
+            elif _IS_WINDOWS:
+                result = await _run(
                     [
                         "wmic",
                         "printjob",
@@ -291,46 +466,38 @@ def register_tools(app: FastMCP) -> None:
                         "get",
                         "Name,Status,PagesPrinted,TotalPages",
                         "/format:csv",
-                    ],
-                    capture_output=True,
-                    text=True,
-                    check=True,
+                    ]
                 )
-                if result.stdout.strip():
-                    lines = result.stdout.strip().split("\n")[1:]
-                    if lines and lines[0].strip():
-                        parts = lines[0].split(",")
-                        if len(parts) >= 4:
-                            try:
-                                pages_printed = int(parts[2]) if parts[2].strip() else 0
-                                total_pages = int(parts[3]) if parts[3].strip() else 1
-                                progress = (
-                                    (pages_printed / total_pages) * 100
-                                    if total_pages > 0
-                                    else 0
-                                )
-                                return {
-                                    "job_id": job_id,
-                                    "status": "printing",
-                                    "progress": f"{progress:.2f}%",
-                                    "pages_printed": pages_printed,
-                                    "total_pages": total_pages,
-                                }
-                            except (ValueError, ZeroDivisionError):
-                                return {"job_id": job_id, "status": "printing"}
-                        else:
+                rows = _wmic_rows(result.stdout)
+                if rows:
+                    parts = rows[0]
+                    if len(parts) >= 4:
+                        try:
+                            pages_printed = int(parts[2]) if parts[2].strip() else 0
+                            total_pages = int(parts[3]) if parts[3].strip() else 1
+                            progress = (
+                                (pages_printed / total_pages) * 100
+                                if total_pages > 0
+                                else 0
+                            )
+                            return {
+                                "job_id": job_id,
+                                "status": "printing",
+                                "progress": f"{progress:.2f}%",
+                                "pages_printed": pages_printed,
+                                "total_pages": total_pages,
+                            }
+                        except (ValueError, ZeroDivisionError):
                             return {"job_id": job_id, "status": "printing"}
+                    else:
+                        return {"job_id": job_id, "status": "printing"}
                 return {"success": False, "error": "No such job found"}
+            elif not _HAS_LPSTAT:
+                return {"success": False, "error": _NO_CUPS_ERROR}
             else:
-                result = subprocess.run(
-                    ["lpstat", "-W", "not-completed", "-o", job_id],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-                if result.stdout.strip():
-                    job_info = result.stdout.strip()
-                    match = re.search(r"(\S+)\s+\S+\s+(\d+)\s+(\d+)", job_info)
+                job_info = _find_print_job(await _get_print_jobs(), job_id)
+                if job_info:
+                    match = _RE_JOBINFO.search(job_info)
                     if match:
                         printer_name = match.group(1)
                         pages_printed = int(match.group(2))
@@ -355,24 +522,30 @@ def register_tools(app: FastMCP) -> None:
                 "success": False,
                 "error": f"Failed to retrieve job info: {e.stderr}",
             }
+        except _WIN32_ERRORS as e:
+            return {"success": False, "error": f"Failed to retrieve job info: {e}"}
 
     @app.tool(
         name="cancel_print_job", description="Cancel a print job", tags=["printer"]
     )
     async def cancel_print_job(job_id: str) -> Dict[str, Any]:
         try:
-            if platform.system() == "Windows":
-                result = subprocess.run(
+            if win32print is not None:
+                cancelled = False
+                if job_id.isdigit():
+                    cancelled = await asyncio.to_thread(_win32_cancel_job, int(job_id))
+                if cancelled:
+                    return {"success": True, "job_id": job_id, "status": "cancelled"}
+                return {"success": False, "error": "Failed to cancel the print job"}
+            elif _IS_WINDOWS:
+                result = await _run(
                     [
                         "wmic",
                         "printjob",
                         "where",
                         f"JobId={job_id}",
                         "delete",
-                    ],
-                    capture_output=True,
-                    text=True,
-                    check=True,
+                    ]
                 )
                 if result.returncode == 0:
                     return {
@@ -385,16 +558,16 @@ def register_tools(app: FastMCP) -> None:
                         "success": False,
                         "error": "Failed to cancel the print job",
                     }
+            elif not _HAS_CANCEL:
+                return {"success": False, "error": _NO_CUPS_ERROR}
             else:
-                result = subprocess.run(
-                    ["cancel", job_id],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
+                result = await _run(["cancel", job_id])
+                _invalidate_print_jobs()
                 if result.returncode == 0:
                     return {"success": True, "job_id": job_id, "status": "cancelled"}
                 else:
                     return {"success": False, "error": "Failed to cancel the print job"}
         except subprocess.CalledProcessError as e:
             return {"success": False, "error": f"Failed to cancel job: {e.stderr}"}
+        except _WIN32_ERRORS as e:
+            return {"success": False, "error": f"Failed to cancel job: {e}"}
@@ -1,19 +1,392 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from screeninfo import get_monitors
 from fastmcp import FastMCP, Image
 from PIL import Image as PILImage
 from datetime import datetime
+from functools import lru_cache
 from typing import Annotated
 from pydantic import Field
 from mss import mss
+from mss.tools import to_png
 import subprocess
+import shutil
 import platform
 import tempfile
+import threading
+import atexit
 import asyncio
+import collections
+import time
 import os
 import io
 
+_SYSTEM = platform.system()
+
 _active_screen_recording = None
+_RECORDING_STARTING = object()
+
+_FFMPEG_PATH = shutil.which("ffmpeg")
+# Grabbers have a known format, so skip input probing and buffering; this
+# also lets a failed start show up sooner.
+_FFMPEG_FAST_START_ARGS = [
+    "-probesize",
+    "32",
+    "-analyzeduration",
+    "0",
+    "-fflags",
+    "nobuffer",
+]
+_FFMPEG_START_TIMEOUT = 2.0
+_FFMPEG_ERROR_TAIL = 4096
+_FFMPEG_LOG_LINES = 64
+_TEMP_DIR = tempfile.gettempdir()
+
+_KMSGRAB_VAAPI_ARGS = [
+    "-vf",
+    "hwmap=derive_device=vaapi,scale_vaapi=format=nv12",
+    "-c:v",
+    "h264_vaapi",
+    "-qp",
+    "23",
+]
+
+_MONITOR_CACHE_TTL = 2.0
+_monitor_cache = {"ts": 0.0, "data": None, "listing": None, "signature": None}
+_monitor_cache_lock = threading.Lock()
+
+# mss handles are tied to the thread that opened them, so each thread keeps
+# its own instead of reconnecting to the display server on every screenshot.
+_sct_local = threading.local()
+_sct_instances = []
+_sct_instances_lock = threading.Lock()
+
+_HW_H264_ENCODERS = {
+    "Windows": ["h264_nvenc", "h264_qsv", "h264_amf"],
+    "Linux": ["h264_nvenc", "h264_qsv"],
+}.get(_SYSTEM, [])
+# Rate control per encoder, the hardware ones roughly matching libx264's.
+_H264_ENCODER_OPTIONS = {
+    # zerolatency drops B-frames and lookahead, which a live capture has no
+    # use for and which otherwise hold extra frames in memory.
+    "libx264": ["-preset", "ultrafast", "-tune", "zerolatency", "-crf", "23"],
+    "h264_nvenc": ["-preset", "p4", "-rc", "vbr", "-cq", "23"],
+    "h264_qsv": ["-global_quality", "23"],
+    "h264_amf": ["-quality", "speed", "-rc", "cqp", "-qp_i", "23", "-qp_p", "25"],
+}
+
+
+@lru_cache(maxsize=1)
+def _get_h264_encoder() -> str:
+    """First hardware H.264 encoder that can encode a test frame, else libx264."""
+    if not _HW_H264_ENCODERS:
+        return "libx264"
+    try:
+        result = subprocess.run(
+            [_FFMPEG_PATH, "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return "libx264"
+
+    for encoder in _HW_H264_ENCODERS:
+        if f" {encoder} " not in result.stdout:
+            continue
+        # Listed encoders may still lack a GPU or driver behind them.
+        try:
+            probe = subprocess.run(
+                [
+                    _FFMPEG_PATH,
+                    "-hide_banner",
+                    "-loglevel",
+                    "error",
+                    "-f",
+                    "lavfi",
+                    "-i",
+                    "color=size=256x256",
+                    "-frames:v",
+                    "1",
+                    "-c:v",
+                    encoder,
+                    *_H264_ENCODER_OPTIONS[encoder],
+                    "-f",
+                    "null",
+                    "-",
+                ],
+                capture_output=True,
+                timeout=10,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        if probe.returncode == 0:
+            return encoder
+    return "libx264"
+
+
+def _get_monitors(refresh: bool = False) -> Tuple[list, List[Dict[str, Any]]]:
+    """Connected monitors and their list_displays entries, cached briefly."""
+    with _monitor_cache_lock:
+        if (
+            not refresh
+            and _monitor_cache["data"] is not None
+            and time.monotonic() - _monitor_cache["ts"] < _MONITOR_CACHE_TTL
+        ):
+            return _monitor_cache["data"], _monitor_cache["listing"]
+
+    monitors = get_monitors()
+    signature = tuple((m.x, m.y, m.width, m.height, m.is_primary) for m in monitors)
+    with _monitor_cache_lock:
+        # Keep handing out the same payload while the layout is unchanged.
+        unchanged = signature == _monitor_cache["signature"]
+        listing = _monitor_cache["listing"]
+    if not unchanged or listing is None:
+        listing = [
+            {
+                "device_id": f"display{i}",
+                "name": f"Display {i}",
+                "resolution": f"{monitor.width}x{monitor.height}",
+                "is_primary": monitor.is_primary,
+                "x": monitor.x,
+                "y": monitor.y,
+            }
+            for i, monitor in enumerate(monitors)
+        ]
+    with _monitor_cache_lock:
+        # An empty result is usually a display server that isn't up yet.
+        _monitor_cache["data"] = monitors or None
+        _monitor_cache["listing"] = listing
+        _monitor_cache["signature"] = signature
+        _monitor_cache["ts"] = time.monotonic()
+    return monitors, listing
+
+
+@lru_cache(maxsize=1)
+def _kmsgrab_usable() -> bool:
+    """Whether kmsgrab can capture and VAAPI can encode here, tried once.
+
+    kmsgrab needs CAP_SYS_ADMIN (or DRM master), which most sessions lack,
+    so a one-frame capture is the only reliable check.
+    """
+    if _FFMPEG_PATH is None or not os.path.isdir("/dev/dri"):
+        return False
+    try:
+        result = subprocess.run(
+            [
+                _FFMPEG_PATH,
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-f",
+                "kmsgrab",
+                "-i",
+                "-",
+                "-frames:v",
+                "1",
+                *_KMSGRAB_VAAPI_ARGS,
+                "-f",
+                "null",
+                "-",
+            ],
+            capture_output=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+async def _wait_for_ffmpeg_output(
+    stderr: asyncio.StreamReader, log: collections.deque
+) -> bool:
+    """Read FFmpeg's log until it reports an opened output; False if it exits.
+
+    FFmpeg only logs "Output #" once the grabber, the encoder and the output
+    file are all open, so a failure in any of them shows up before it.
+    """
+    while True:
+        try:
+            line = await stderr.readline()
+        except ValueError:
+            # readline drops a line longer than the reader's limit; carry on.
+            continue
+        if not line:
+            return False
+        log.append(line)
+        if line.startswith(b"Output #"):
+            return True
+
+
+async def _drain_ffmpeg_log(
+    stderr: asyncio.StreamReader, log: collections.deque
+) -> None:
+    while True:
+        try:
+            line = await stderr.readline()
+        except ValueError:
+            # readline drops a line longer than the reader's limit; carry on.
+            continue
+        if not line:
+            return
+        log.append(line)
+
+
+def _parse_display_index(device_id: Optional[str]) -> int:
+    """Return N for a 'displayN' device_id, or 0 when none is given.
+
+    A bare 'N' is accepted too, as record_screen used to take one. Raises
+    ValueError for anything else.
+    """
+    if not device_id:
+        return 0
+    if device_id.isdigit():
+        return int(device_id)
+    if device_id[:7] != "display" or not device_id[7:].isdigit():
+        raise ValueError(
+            f"Invalid device_id format: {device_id}. Expected format: 'displayN'"
+        )
+    return int(device_id[7:])
+
+
+def _resolve_save_path(save_path: Optional[str], prefix: str, ext: str) -> str:
+    """Turn a tool's save_path argument into a file path and create its folder.
+
+    None means a timestamped file in the temp directory, and a directory
+    (or anything ending in a separator) gets a timestamped file inside it.
+    """
+    if save_path is None:
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        return os.path.join(_TEMP_DIR, f"{prefix}_{timestamp}{ext}")
+
+    # The separator check is free; only stat the path when it doesn't decide.
+    if save_path.endswith(("/", "\\")) or os.path.isdir(save_path):
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        save_path = os.path.join(save_path, f"{prefix}_{timestamp}{ext}")
+    elif not os.path.splitext(save_path)[1]:
+        save_path = save_path + ext
+
+    dir_path = os.path.dirname(save_path)
+    if dir_path:
+        os.makedirs(dir_path, exist_ok=True)
+    return save_path
+
+
+def _file_size(path: str) -> Optional[int]:
+    """Size of ``path`` from a single stat, or None if it doesn't exist."""
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return None
+
+
+def _get_sct():
+    sct = getattr(_sct_local, "sct", None)
+    if sct is None:
+        sct = mss()
+        _sct_local.sct = sct
+        with _sct_instances_lock:
+            _sct_instances.append(sct)
+    return sct
+
+
+def _reset_sct() -> None:
+    sct = getattr(_sct_local, "sct", None)
+    if sct is None:
+        return
+    _sct_local.sct = None
+    with _sct_instances_lock:
+        _sct_instances.remove(sct)
+    try:
+        sct.close()
+    except Exception:
+        pass
+
+
+def _get_sct_for(mon: int):
+    sct = _get_sct()
+    if mon >= len(sct.monitors):
+        # mss reads the monitor layout once per instance.
+        _reset_sct()
+        sct = _get_sct()
+    return sct
+
+
+def _grab_area(sct, mon: int, region: Optional[Dict[str, int]]) -> Dict[str, int]:
+    """The mss rectangle for ``region`` (relative to monitor ``mon``) or all of it."""
+    monitor = sct.monitors[mon]
+    if region is None:
+        return monitor
+    return {
+        "left": monitor["left"] + region["left"],
+        "top": monitor["top"] + region["top"],
+        "width": region["width"],
+        "height": region["height"],
+    }
+
+
+def _take_screenshot(
+    mon: int, path: str, region: Optional[Dict[str, int]] = None
+) -> None:
+    """Save mss monitor ``mon`` (or a region of it) to ``path`` as PNG."""
+    sct = _get_sct_for(mon)
+    try:
+        if region is None:
+            sct.shot(mon=mon, output=path)
+            return
+        # Only the requested rectangle is copied out of the framebuffer.
+        shot = sct.grab(_grab_area(sct, mon, region))
+    except Exception:
+        # Don't keep a handle whose display connection went bad.
+        _reset_sct()
+        raise
+    to_png(shot.rgb, shot.size, level=sct.compression_level, output=path)
+
+
+def _capture_thumbnail(
+    mon: int,
+    max_size: int,
+    path: Optional[str] = None,
+    region: Optional[Dict[str, int]] = None,
+    image_format: str = "png",
+) -> bytes:
+    """Grab mss monitor ``mon`` and encode it scaled to fit ``max_size``.
+
+    The frame goes straight from the grab to the resize, and the full-size
+    PNG is only encoded when ``path`` is given. ``image_format`` is "png" or
+    "jpeg" and only applies to the returned thumbnail.
+    """
+    sct = _get_sct_for(mon)
+    try:
+        shot = sct.grab(_grab_area(sct, mon, region))
+    except Exception:
+        _reset_sct()
+        raise
+    if path:
+        to_png(shot.rgb, shot.size, level=sct.compression_level, output=path)
+
+    img = PILImage.frombytes("RGB", shot.size, shot.rgb)
+    img.thumbnail((max_size, max_size), PILImage.Resampling.LANCZOS)
+
+    img_bytes = io.BytesIO()
+    if image_format == "jpeg":
+        img.save(img_bytes, format="JPEG", quality=85)
+    else:
+        # optimize=True re-runs the deflate search for a ~1% smaller file at
+        # several times the cost; the default level is the better trade here.
+        img.save(img_bytes, format="PNG")
+    return img_bytes.getvalue()
+
+
+@atexit.register
+def _close_scts() -> None:
+    with _sct_instances_lock:
+        instances = list(_sct_instances)
+        _sct_instances.clear()
+    for sct in instances:
+        try:
+            sct.close()
+        except Exception:
+            pass
 
 
 def register_tools(app: FastMCP) -> None:
@@ -23,21 +396,7 @@ def register_tools(app: FastMCP) -> None:
         tags=["screen"],
     )
     async def list_displays() -> List[Dict[str, Any]]:
-        displays = []
-        monitors = get_monitors()
-
-        for i, monitor in enumerate(monitors):
-            displays.append(
-                {
-                    "device_id": f"display{i}",
-                    "name": f"Display {i}",
-                    "resolution": f"{monitor.width}x{monitor.height}",
-                    "is_primary": monitor.is_primary,
-                    "x": monitor.x,
-                    "y": monitor.y,
-                }
-            )
-
+        _, displays = _get_monitors()
         return displays
 
     @app.tool(
@@ -66,27 +425,44 @@ def register_tools(app: FastMCP) -> None:
                 description="Whether to return the screenshot only, managing to stay within MCP response limits.",
             ),
         ] = False,
+        region: Annotated[
+            Optional[Dict[str, int]],
+            Field(
+                default=None,
+                description="Capture only this rectangle of the display, given as left, top, width and height in pixels relative to the display's top-left corner. If None, the whole display is captured",
+            ),
+        ] = None,
+        image_format: Annotated[
+            str,
+            Field(
+                default="png",
+                description="Encoding of the image returned when return_image is True: 'png' (lossless) or 'jpeg' (much smaller and faster to encode). The saved file is always PNG",
+            ),
+        ] = "png",
     ) -> Dict[str, Any]:
         try:
-            display_index = 0
-            if device_id and device_id.startswith("display"):
-                try:
-                    display_index = int(device_id.replace("display", ""))
-                except ValueError:
-                    return {
-                        "success": False,
-                        "error": f"Invalid device_id format: {device_id}. Expected format: 'displayN'",
-                    }
+            if image_format not in ("png", "jpeg"):
+                return {
+                    "success": False,
+                    "error": f"Unsupported image_format: {image_format}. Expected 'png' or 'jpeg'",
+                }
+
+            try:
+                display_index = _parse_display_index(device_id)
+            except ValueError as e:
+                return {"success": False, "error": str(e)}
 
-            monitors = get_monitors()
+            monitors, _ = _get_monitors()
+            if display_index >= len(monitors):
+                # A display may have been connected since the cached lookup.
+                monitors, _ = _get_monitors(refresh=True)
             if not monitors:
-                system = platform.system()
                 error_msg = "No displays found."
-                if system == "Linux":
+                if _SYSTEM == "Linux":
                     error_msg += " On Linux, ensure X11 or Wayland is running and display permissions are granted."
-                elif system == "Windows":
+                elif _SYSTEM == "Windows":
                     error_msg += " Ensure display drivers are properly installed."
-                elif system == "Darwin":
+                elif _SYSTEM == "Darwin":
                     error_msg += " Check macOS display permissions in System Preferences > Security & Privacy > Privacy > Screen Recording."
                 return {"success": False, "error": error_msg}
 
@@ -96,78 +472,69 @@ def register_tools(app: FastMCP) -> None:
                     "error": f"Display {device_id} not found. Available displays: 0-{len(monitors) - 1}",
                 }
 
-            try:
-                with mss() as sct:
-                    if save_path is None:
-                        temp_dir = tempfile.gettempdir()
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        save_path = os.path.join(
-                            temp_dir, f"screenshot_{timestamp}.png"
-                        )
-                    else:
-                        if (
-                            os.path.isdir(save_path)
-                            or save_path.endswith("/")
-                            or save_path.endswith("\\")
-                        ):
-                            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                            save_path = os.path.join(
-                                save_path, f"screenshot_{timestamp}.png"
-                            )
-                        else:
-                            if not os.path.splitext(save_path)[1]:
-                                save_path = save_path + ".png"
-
-                        dir_path = os.path.dirname(save_path)
-                        if dir_path:
-                            os.makedirs(dir_path, exist_ok=True)
-
-                    sct.shot(mon=display_index + 1, output=save_path)
-
-                    if not os.path.exists(save_path):
-                        return {
-                            "success": False,
-                            "error": "Screenshot file was not created",
-                        }
-
-                    result = {
-                        "success": True,
-                        "file_path": save_path,
-                        "file_size": os.path.getsize(save_path),
+            if region is not None:
+                monitor = monitors[display_index]
+                try:
+                    region = {
+                        key: int(region[key])
+                        for key in ("left", "top", "width", "height")
+                    }
+                except (KeyError, TypeError, ValueError):
+                    return {
+                        "success": False,
+                        "error": "region must have integer left, top, width and height",
+                    }
+                if (
+                    region["left"] < 0
+                    or region["top"] < 0
+                    or region["width"] <= 0
+                    or region["height"] <= 0
+                    or region["left"] + region["width"] > monitor.width
+                    or region["top"] + region["height"] > monitor.height
+                ):
+                    return {
+                        "success": False,
+                        "error": f"region must lie within the {monitor.width}x{monitor.height} display",
                     }
 
-                    if return_image:
-                        try:
-                            with PILImage.open(save_path) as img:
-                                max_size = 512
-                                original_width, original_height = img.size
-
-                                scale_factor = min(
-                                    max_size / original_width,
-                                    max_size / original_height,
-                                )
-                                new_width = int(original_width * scale_factor)
-                                new_height = int(original_height * scale_factor)
-
-                                img = img.resize(
-                                    (new_width, new_height), PILImage.Resampling.LANCZOS
-                                )
+            try:
+                # A returned image is all the caller gets back, so only write a
+                # file for it when a path was asked for.
+                if save_path is not None or not return_image:
+                    save_path = _resolve_save_path(save_path, "screenshot", ".png")
+
+                if return_image:
+                    thumbnail = await asyncio.to_thread(
+                        _capture_thumbnail,
+                        display_index + 1,
+                        512,
+                        save_path,
+                        region,
+                        image_format,
+                    )
+                    return Image(data=thumbnail, format=image_format)
 
-                                img_bytes = io.BytesIO()
-                                img.save(img_bytes, format="PNG", optimize=True)
-                                img_bytes.seek(0)
+                await asyncio.to_thread(
+                    _take_screenshot, display_index + 1, save_path, region
+                )
 
-                                return Image(data=img_bytes.getvalue(), format="png")
-                        except Exception as e:
-                            result["image_error"] = f"Failed to create image: {str(e)}"
+                file_size = _file_size(save_path)
+                if file_size is None:
+                    return {
+                        "success": False,
+                        "error": "Screenshot file was not created",
+                    }
 
-                    return result
+                return {
+                    "success": True,
+                    "file_path": save_path,
+                    "file_size": file_size,
+                }
             except PermissionError as e:
-                system = platform.system()
                 error_msg = f"Permission denied: {str(e)}."
-                if system == "Darwin":
+                if _SYSTEM == "Darwin":
                     error_msg += " Grant screen recording permissions in System Preferences > Security & Privacy > Privacy > Screen Recording."
-                elif system == "Linux":
+                elif _SYSTEM == "Linux":
                     error_msg += " Check X11/Wayland permissions or run with appropriate privileges."
                 return {"success": False, "error": error_msg}
         except Exception as e:
@@ -180,10 +547,10 @@ def register_tools(app: FastMCP) -> None:
         device_id: Annotated[
             Optional[str],
             Field(
-                description="The display identifier which should be passed as input format to ffmpeg.",
-                default="0",
+                description="The display identifier in format 'displayN' where N is the display index (e.g., 'display0', 'display1'). A bare index such as '0' is also accepted",
+                default="display0",
             ),
-        ] = "0",
+        ] = "display0",
         save_path: Annotated[
             Optional[str],
             Field(
@@ -227,19 +594,22 @@ def register_tools(app: FastMCP) -> None:
                     "error": "FPS should not exceed 60 for optimal performance",
                 }
 
-            display_index = 0
-            if device_id and device_id.startswith("display"):
-                display_index = int(device_id.replace("display", ""))
+            try:
+                display_index = _parse_display_index(device_id)
+            except ValueError as e:
+                return {"success": False, "error": str(e)}
 
-            monitors = get_monitors()
+            monitors, _ = _get_monitors()
+            if display_index >= len(monitors):
+                # A display may have been connected since the cached lookup.
+                monitors, _ = _get_monitors(refresh=True)
             if not monitors:
-                system = platform.system()
                 error_msg = "No displays found."
-                if system == "Linux":
+                if _SYSTEM == "Linux":
                     error_msg += " On Linux, ensure X11 or Wayland is running and display permissions are granted."
-                elif system == "Windows":
+                elif _SYSTEM == "Windows":
                     error_msg += " Ensure display drivers are properly installed."
-                elif system == "Darwin":
+                elif _SYSTEM == "Darwin":
                     error_msg += " Check macOS display permissions in System Preferences > Security & Privacy > Privacy > Screen Recording."
                 return {"success": False, "error": error_msg}
 
@@ -249,40 +619,9 @@ def register_tools(app: FastMCP) -> None:
                     "error": f"Display {device_id} not found. Available displays: 0-{len(monitors) - 1}",
                 }
 
-            if save_path is None:
-                temp_dir = tempfile.gettempdir()
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                save_path = os.path.join(temp_dir, f"screen_recording_{timestamp}.mp4")
-            else:
-                if (
-                    os.path.isdir(save_path)
-                    or save_path.endswith("/")
-                    or save_path.endswith("\\")
-                ):
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    save_path = os.path.join(
-                        save_path, f"screen_recording_{timestamp}.mp4"
-                    )
-                else:
-                    if not os.path.splitext(save_path)[1]:
-                        save_path = save_path + ".mp4"
-
-                dir_path = os.path.dirname(save_path)
-                if dir_path:
-                    os.makedirs(dir_path, exist_ok=True)
+            save_path = _resolve_save_path(save_path, "screen_recording", ".mp4")
 
-            try:
-                result = subprocess.run(
-                    ["ffmpeg", "-version"], capture_output=True, text=True, timeout=10
-                )
-                if result.returncode != 0:
-                    raise FileNotFoundError("FFmpeg not found or not working")
-            except (
-                subprocess.TimeoutExpired,
-                subprocess.CalledProcessError,
-                FileNotFoundError,
-            ):
-                system = platform.system()
+            if _FFMPEG_PATH is None:
                 install_commands = {
                     "Windows": "winget install ffmpeg  OR  download from https://ffmpeg.org/",
                     "Darwin": "brew install ffmpeg",
@@ -290,35 +629,52 @@ def register_tools(app: FastMCP) -> None:
                 }
                 return {
                     "success": False,
-                    "error": f"Screen recording requires FFmpeg. Install it using: {install_commands.get(system, 'ffmpeg')}",
+                    "error": f"Screen recording requires FFmpeg. Install it using: {install_commands.get(_SYSTEM, 'ffmpeg')}",
                 }
 
-            system = platform.system()
-            if system == "Windows":
+            if _SYSTEM != "Darwin":
+                encoder = await asyncio.to_thread(_get_h264_encoder)
+                encoder_args = ["-c:v", encoder, *_H264_ENCODER_OPTIONS[encoder]]
+                if encoder == "libx264":
+                    # A keyframe every two seconds instead of x264's 250 frames.
+                    encoder_args.extend(["-g", str(max(1, round((fps or 15.0) * 2)))])
+
+            if _SYSTEM == "Windows":
+                # ddagrab is a lavfi source that captures into D3D11 textures.
+                # NVENC and AMF encode those in place; QSV maps them onto its
+                # own device and only libx264 copies frames back to memory.
                 ffmpeg_args = [
-                    "ffmpeg",
+                    _FFMPEG_PATH,
                     "-y",
+                    "-nostats",
+                    *_FFMPEG_FAST_START_ARGS,
                     "-f",
-                    "ddagrab",
-                    "-framerate",
-                    str(fps),
+                    "lavfi",
                     "-i",
-                    f"\\\\.\\DISPLAY{display_index + 1}",
-                    "-c:v",
-                    "libx264",
-                    "-preset",
-                    "ultrafast",
-                    "-crf",
-                    "23",
-                    "-pix_fmt",
-                    "yuv420p",
-                    "-threads",
-                    "2",
+                    f"ddagrab=output_idx={display_index}:framerate={fps}",
                 ]
-            elif system == "Darwin":
+                if encoder == "libx264":
+                    ffmpeg_args.extend(
+                        [
+                            "-vf",
+                            "hwdownload,format=bgra",
+                            *encoder_args,
+                            "-pix_fmt",
+                            "yuv420p",
+                        ]
+                    )
+                elif encoder == "h264_qsv":
+                    ffmpeg_args.extend(
+                        ["-vf", "hwmap=derive_device=qsv,format=qsv", *encoder_args]
+                    )
+                else:
+                    ffmpeg_args.extend(encoder_args)
+            elif _SYSTEM == "Darwin":
                 ffmpeg_args = [
-                    "ffmpeg",
+                    _FFMPEG_PATH,
                     "-y",
+                    "-nostats",
+                    *_FFMPEG_FAST_START_ARGS,
                     "-f",
                     "avfoundation",
                     "-framerate",
@@ -338,24 +694,41 @@ def register_tools(app: FastMCP) -> None:
                     "-threads",
                     "2",
                 ]
+            elif (
+                _SYSTEM == "Linux"
+                and display_index == 0
+                and await asyncio.to_thread(_kmsgrab_usable)
+            ):
+                # kmsgrab hands the DRM framebuffer to VAAPI, so frames go from
+                # scan-out to the encoder without a copy through system memory.
+                ffmpeg_args = [
+                    _FFMPEG_PATH,
+                    "-y",
+                    "-nostats",
+                    *_FFMPEG_FAST_START_ARGS,
+                    "-framerate",
+                    str(fps),
+                    "-f",
+                    "kmsgrab",
+                    "-i",
+                    "-",
+                    *_KMSGRAB_VAAPI_ARGS,
+                ]
             else:
                 ffmpeg_args = [
-                    "ffmpeg",
+                    _FFMPEG_PATH,
                     "-y",
+                    "-nostats",
+                    *_FFMPEG_FAST_START_ARGS,
                     "-f",
                     "x11grab",
                     "-framerate",
                     str(fps),
                     "-i",
                     f":{display_index}",
-                    "-c:v",
-                    "libx264",
-                    "-preset",
-                    "ultrafast",
-                    "-crf",
-                    "23",
+                    *encoder_args,
                     "-pix_fmt",
-                    "yuv420p",
+                    "nv12" if encoder == "h264_qsv" else "yuv420p",
                 ]
 
             if duration != -1:
@@ -363,32 +736,61 @@ def register_tools(app: FastMCP) -> None:
 
             ffmpeg_args.append(save_path)
             if duration == -1:
-                proc = subprocess.Popen(
-                    ffmpeg_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                _active_screen_recording = {
-                    "process": proc,
-                    "file_path": save_path,
-                    "device_id": device_id,
-                    "start_time": datetime.now(),
-                }
+                if _active_screen_recording is not None:
+                    return {
+                        "success": False,
+                        "error": "Another screen recording is already in progress. Stop it first using stop_record_screen.",
+                    }
+                # Hold the slot until FFmpeg is up, so a stop or another start
+                # in the meantime sees the recording as starting.
+                _active_screen_recording = _RECORDING_STARTING
+                try:
+                    proc = await asyncio.create_subprocess_exec(
+                        *ffmpeg_args,
+                        stdout=asyncio.subprocess.DEVNULL,
+                        stderr=asyncio.subprocess.PIPE,
+                    )
+                    log = collections.deque(maxlen=_FFMPEG_LOG_LINES)
 
-                await asyncio.sleep(0.5)
-                if proc.poll() is not None:
-                    _active_screen_recording = None
+                    # FFmpeg logs the opened output once the display and the
+                    # encoder are up, or exits with its error; no fixed sleep.
                     try:
-                        stdout, stderr = proc.communicate()
-                        error_msg = stderr.decode() if stderr else "Unknown error"
-                        return {
-                            "success": False,
-                            "error": f"Recording failed to start: {error_msg}",
-                        }
-                    except Exception as e:
+                        started = await asyncio.wait_for(
+                            _wait_for_ffmpeg_output(proc.stderr, log),
+                            timeout=_FFMPEG_START_TIMEOUT,
+                        )
+                    except asyncio.TimeoutError:
+                        started = proc.returncode is None
+                    except BaseException:
+                        proc.kill()
+                        await proc.wait()
+                        raise
+
+                    if not started:
+                        await proc.wait()
+                        error_msg = b"".join(log)[-_FFMPEG_ERROR_TAIL:].decode(
+                            errors="replace"
+                        )
                         return {
                             "success": False,
-                            "error": "Recording failed to start: " + str(e),
+                            "error": f"Recording failed to start: {error_msg or 'Unknown error'}",
                         }
 
+                    _active_screen_recording = {
+                        "process": proc,
+                        "file_path": save_path,
+                        "device_id": device_id,
+                        "start_time": datetime.now(),
+                        # Keep reading FFmpeg's log, only its tail, so a long
+                        # recording can't fill the pipe and stall the encoder.
+                        "log_task": asyncio.create_task(
+                            _drain_ffmpeg_log(proc.stderr, log)
+                        ),
+                    }
+                finally:
+                    if _active_screen_recording is _RECORDING_STARTING:
+                        _active_screen_recording = None
+
                 return {
                     "success": True,
                     "file_path": save_path,
@@ -396,13 +798,23 @@ def register_tools(app: FastMCP) -> None:
                     "message": "Background recording started. Use stop_record_screen to stop.",
                 }
 
-            result = subprocess.run(ffmpeg_args, capture_output=True, text=True)
-            if result.returncode != 0:
-                error_details = result.stderr
+            proc = await asyncio.create_subprocess_exec(
+                *ffmpeg_args,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                _, stderr = await proc.communicate()
+            except asyncio.CancelledError:
+                proc.kill()
+                await proc.wait()
+                raise
+            if proc.returncode != 0:
+                error_details = stderr.decode(errors="replace")
                 if "Permission denied" in error_details:
-                    if system == "Darwin":
+                    if _SYSTEM == "Darwin":
                         error_details += "\nGrant screen recording permissions in System Preferences > Security & Privacy > Privacy > Screen Recording."
-                    elif system == "Linux":
+                    elif _SYSTEM == "Linux":
                         error_details += "\nCheck X11/Wayland permissions or run with appropriate privileges."
                 elif "No such file or directory" in error_details:
                     error_details += (
@@ -416,7 +828,7 @@ def register_tools(app: FastMCP) -> None:
                     "error": f"FFmpeg recording failed: {error_details}",
                 }
 
-            if not os.path.exists(save_path) or os.path.getsize(save_path) == 0:
+            if not _file_size(save_path):
                 return {
                     "success": False,
                     "error": "Video file was not created or is empty",
@@ -427,11 +839,10 @@ def register_tools(app: FastMCP) -> None:
                 "file_path": save_path,
             }
         except PermissionError as e:
-            system = platform.system()
             error_msg = f"Permission denied: {str(e)}."
-            if system == "Darwin":
+            if _SYSTEM == "Darwin":
                 error_msg += " Grant screen recording permissions in System Preferences > Security & Privacy > Privacy > Screen Recording."
-            elif system == "Linux":
+            elif _SYSTEM == "Linux":
                 error_msg += (
                     " Check X11/Wayland permissions or run with appropriate privileges."
                 )
@@ -449,6 +860,8 @@ def register_tools(app: FastMCP) -> None:
 
         if _active_screen_recording is None:
             return {"success": False, "error": "No active screen recording found"}
+        if _active_screen_recording is _RECORDING_STARTING:
+            return {"success": False, "error": "Screen recording is still starting"}
 
         try:
             process = _active_screen_recording["process"]
@@ -459,21 +872,23 @@ def register_tools(app: FastMCP) -> None:
             process.terminate()
 
             try:
-                process.wait(timeout=10)
-            except subprocess.TimeoutExpired:
+                await asyncio.wait_for(process.wait(), 10)
+            except asyncio.TimeoutError:
                 process.kill()
-                process.wait()
+                await process.wait()
+            await _active_screen_recording["log_task"]
 
             _active_screen_recording = None
 
-            if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
+            file_size = _file_size(file_path)
+            if file_size:
                 duration = (datetime.now() - start_time).total_seconds()
                 return {
                     "success": True,
                     "file_path": file_path,
                     "device_id": device_id,
                     "duration": f"{duration:.1f} seconds",
-                    "file_size": os.path.getsize(file_path),
+                    "file_size": file_size,
                 }
             else:
                 return {
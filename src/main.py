@@ -2,12 +2,22 @@ from server import create_app
 from config import get_settings
 import asyncio
 
+try:
+    # Optional: the "uvloop" extra, unavailable on Windows.
+    import uvloop
+except ImportError:
+    uvloop = None
+
 
 def main():
     settings = get_settings()
     app = create_app(settings)
+    # FastMCP starts its own loop through anyio, which takes new loops from
+    # the asyncio policy; uvloop is used when it is available.
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     app.run()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
@@ -1,7 +1,11 @@
+import importlib
+
 from fastmcp import FastMCP
 
 from config import Settings
-from devices import camera, printer, audio, screen
+
+# Device modules under devices/, each toggled by the matching enable_<name> setting.
+_DEVICE_MODULES = ("camera", "printer", "audio", "screen")
 
 
 def create_app(settings: Settings) -> FastMCP:
@@ -10,16 +14,15 @@ def create_app(settings: Settings) -> FastMCP:
         instructions="A device server that provides access to various computer peripherals including camera, printer, audio and screen. Use the available tools to interact with connected hardware components.",
     )
 
-    if settings.enable_camera:
-        camera.register_tools(app)
-
-    if settings.enable_printer:
-        printer.register_tools(app)
+    # Each device module pulls in its own native libraries (OpenCV, PyAudio,
+    # mss/Pillow), so only import the ones that are actually enabled.
+    for name in _DEVICE_MODULES:
+        if getattr(settings, f"enable_{name}"):
+            importlib.import_module(f"devices.{name}").register_tools(app)
 
-    if settings.enable_audio:
-        audio.register_tools(app)
+    if settings.enable_camera and settings.camera_warmup:
+        from devices import camera
 
-    if settings.enable_screen:
-        screen.register_tools(app)
+        camera.warm_up_cameras()
 
     return app